@@ -1,11 +1,30 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, g, Response, stream_with_context
 from config import Config
-from models import Database, User, Event, Registration, Category, Comment, Rating
-from datetime import datetime
+from models import Database, User, Event, Registration, Category, Comment, Rating, cache, page_cache
+import async_models
+from export import stream_csv, stream_xlsx
+from metrics import metrics
+from passwords import PasswordHasherBusy
+from scheduler import EventStatusScheduler
+from migrations import migrate
+from query_plans import check as check_query_plans
+from werkzeug.http import is_resource_modified
+from datetime import datetime, timezone
+import asyncio
+import click
+import csv
+import hashlib
+import hmac
+import io
 import os
+import re
+import time
+from urllib.parse import urlencode
 
 app = Flask(__name__)
 app.config.from_object(Config)
+# Без явного рівня журнал Flask пропускає INFO, і рядки запитів губляться
+app.logger.setLevel(app.config['LOG_LEVEL'])
 
 # Словник перекладу статусів
 STATUS_TRANSLATIONS = {
@@ -15,6 +34,13 @@ STATUS_TRANSLATIONS = {
     'cancelled': 'Скасована'
 }
 
+# Переклад статусів реєстрацій (експорт учасників, панель організатора)
+REGISTRATION_STATUS_TRANSLATIONS = {
+    'registered': 'Зареєстрований',
+    'attended': 'Відвідав',
+    'cancelled': 'Скасований'
+}
+
 # Регістрація фільтра для шаблонів
 @app.template_filter('translate_status')
 def translate_status(status):
@@ -28,6 +54,109 @@ def init_db():
     global db
     db.connect()
 
+# Час кожного SQL-шаблону потрапляє в /metrics
+db.query_listeners.append(metrics.observe_query)
+
+# Пул для async-представлень; запити обліковуються в статистиці та метриках db
+async_db = async_models.AsyncDatabase(db)
+
+# Закриття реєстрації та переходи статусів подій за часом
+status_scheduler = EventStatusScheduler(db, interval=app.config['EVENT_SCHEDULER_INTERVAL'],
+                                        duration_hours=app.config['EVENT_DURATION_HOURS'],
+                                        batch_size=app.config['EVENT_STATUS_BATCH_SIZE'])
+
+@app.before_request
+def start_request_timer():
+    """Початок вимірювання часу запиту та кількості звернень до БД"""
+    g.request_started = time.perf_counter()
+    db.start_request_stats()
+    if db.replicas:
+        # Після недавнього запису користувача (наприклад, редірект після реєстрації на подію)
+        # його читання йдуть на основний сервер, щоб він бачив власні зміни
+        primary_until = session.get('primary_until')
+        db.pin_primary(primary_until - time.time() if primary_until else 0)
+
+@app.after_request
+def record_request_metrics(response):
+    """Метрики маршруту, рядок журналу та (у debug) заголовки зі статистикою БД"""
+    if 'request_started' not in g:
+        return response
+    elapsed = time.perf_counter() - g.request_started
+    stats = db.pop_request_stats()
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    if db.pop_last_write() and db.replicas:
+        session['primary_until'] = time.time() + app.config['DB_REPLICA_PIN_SECONDS']
+    
+    metrics.observe_request(route, request.method, elapsed, stats['queries'])
+    app.logger.info('%s %s %s %.1fms queries=%d db=%.1fms', request.method, route, response.status_code,
+                    elapsed * 1000, stats['queries'], stats['db_time'] * 1000)
+    
+    if app.debug or app.config['QUERY_STATS_HEADERS']:
+        response.headers['X-DB-Query-Count'] = str(stats['queries'])
+        response.headers['X-DB-Time-ms'] = f"{stats['db_time'] * 1000:.1f}"
+    return response
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Метрики у форматі Prometheus"""
+    if not app.config['METRICS_ENABLED']:
+        return {'error': 'Not found'}, 404
+    token = app.config['METRICS_TOKEN']
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return {'error': 'Unauthorized'}, 401
+    
+    gauges = {}
+    counters = {}
+    pool = db.pool_stats()
+    if pool:
+        gauges.update({
+            'unimeet_db_pool_in_use': ("З'єднання, видані з пулу", pool['in_use']),
+            'unimeet_db_pool_idle': ("Вільні з'єднання пулу", pool['idle']),
+            'unimeet_db_pool_waiters': ("Потоки, що чекають на з'єднання", pool['waiters']),
+        })
+        counters.update({
+            'unimeet_db_pool_wait_seconds_total': ("Сумарний час очікування з'єднання", pool['wait_time_total']),
+            'unimeet_db_pool_timeouts_total': ("Відмови через вичерпання пулу", pool['timeouts']),
+        })
+    if db.replicas:
+        routing = db.routing_stats()
+        counters.update({
+            'unimeet_db_replica_reads_total': ('Читання з реплік', routing['replica_reads']),
+            'unimeet_db_primary_reads_total': ('Читання з основного сервера', routing['primary_reads']),
+            'unimeet_db_replica_failures_total': ('Переходи на основний сервер через недоступну репліку',
+                                                  routing['replica_failures']),
+        })
+    statements = db.statement_stats()
+    if statements:
+        counters.update({
+            'unimeet_db_prepared_hits_total': ('Повторно використані prepared statements', statements['hits']),
+            'unimeet_db_prepared_misses_total': ('Підготовлені на сервері prepared statements', statements['misses']),
+        })
+    cache_stats = cache.stats()
+    counters.update({
+        'unimeet_cache_hits_total': ('Влучання в кеш', cache_stats['hits']),
+        'unimeet_cache_misses_total': ('Промахи кешу', cache_stats['misses']),
+    })
+    page_stats = page_cache.stats()
+    counters.update({
+        'unimeet_page_cache_hits_total': ('Сторінки, віддані з кешу', page_stats['hits']),
+        'unimeet_page_cache_misses_total': ('Сторінки, відрендерені заново', page_stats['misses']),
+    })
+    gauges['unimeet_page_cache_entries'] = ('Сторінок у кеші', page_stats['entries'])
+    return Response(metrics.render(gauges, counters), mimetype='text/plain; version=0.0.4')
+
+@app.errorhandler(PasswordHasherBusy)
+def password_hasher_busy(error):
+    """Черга хешування паролів заповнена (масовий вхід): форма з повідомленням і статусом 503"""
+    flash('Забагато одночасних входів, спробуйте ще раз за кілька секунд', 'warning')
+    template = 'register.html' if request.endpoint == 'register' else 'login.html'
+    return render_template(template), 503, {'Retry-After': '5'}
+
+@app.teardown_appcontext
+def release_db(exception=None):
+    """Повернення з'єднання в пул після завершення запиту"""
+    db.release()
+
 def get_models():
     """Отримання всіх моделей"""
     return {
@@ -39,6 +168,29 @@ def get_models():
         'rating': Rating(db)
     }
 
+def get_async_models():
+    """Асинхронні моделі (лише читання) для async-представлень"""
+    return {
+        'user': async_models.User(async_db),
+        'event': async_models.Event(async_db),
+        'registration': async_models.Registration(async_db),
+        'category': async_models.Category(async_db),
+        'comment': async_models.Comment(async_db),
+        'rating': async_models.Rating(async_db)
+    }
+
+def get_current_user():
+    """Поточний користувач у межах запиту (з кешу, без запиту до БД у типовому випадку)"""
+    if 'current_user' not in g:
+        user = None
+        if 'user_id' in session:
+            user = get_models()['user'].get_principal(session['user_id'])
+            if user and session.get('role') != user['role']:
+                # Роль змінив адміністратор — оновлюємо сесію, щоб меню відповідало правам
+                session['role'] = user['role']
+        g.current_user = user
+    return g.current_user
+
 # Декоратор для перевірки авторизації
 def login_required(f):
     from functools import wraps
@@ -47,7 +199,7 @@ def login_required(f):
         if 'user_id' not in session:
             flash('Будь ласка, увійдіть в систему', 'warning')
             return redirect(url_for('login'))
-        return f(*args, **kwargs)
+        return app.ensure_sync(f)(*args, **kwargs)
     return decorated_function
 
 # Декоратор для перевірки ролі організатора
@@ -59,21 +211,94 @@ def organizer_required(f):
             flash('Будь ласка, увійдіть в систему', 'warning')
             return redirect(url_for('login'))
         
-        models = get_models()
-        user = models['user'].get_by_id(session['user_id'])
+        user = get_current_user()
+        if not user:
+            session.clear()
+            flash('Будь ласка, увійдіть в систему', 'warning')
+            return redirect(url_for('login'))
         if user['role'] not in ['organizer', 'admin']:
             flash('У вас немає доступу до цієї сторінки', 'danger')
             return redirect(url_for('index'))
-        return f(*args, **kwargs)
+        return app.ensure_sync(f)(*args, **kwargs)
     return decorated_function
 
+def _templates_version():
+    """Час останньої зміни шаблонів: новий реліз робить недійсними всі ETag"""
+    folder = os.path.join(app.root_path, app.template_folder)
+    return max((os.path.getmtime(os.path.join(root, name))
+                for root, _, files in os.walk(folder) for name in files), default=0)
+
+TEMPLATES_VERSION = _templates_version()
+
+def page_etag(version, *parts):
+    """ETag сторінки з версії даних і стану сесії, від якого залежить розмітка
+    
+    None, якщо валідатора немає або в сесії чекають flash-повідомлення (їх треба відрендерити).
+    """
+    if not version or session.get('_flashes'):
+        return None
+    raw = '|'.join(str(part) for part in (TEMPLATES_VERSION, *version.values(),
+                                          session.get('user_id'), session.get('role'), *parts))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def not_modified(etag, last_modified=None):
+    """Відповідь 304, якщо клієнт уже має цю версію сторінки, інакше None
+    
+    Рішення приймається лише за ETag: HTTP-дата має секундну точність і не відображає видалень.
+    """
+    if etag and not is_resource_modified(request.environ, etag=etag):
+        return with_validators(Response(status=304), etag, last_modified)
+    return None
+
+def anonymous_page_key(*arg_names):
+    """Ключ кешу готової сторінки (маршрут і аргументи) або None, якщо сторінку не можна кешувати"""
+    if not app.config['PAGE_CACHE_ENABLED'] or session.get('user_id') or session.get('_flashes'):
+        return None
+    args = sorted((name, request.args[name]) for name in arg_names if name in request.args)
+    return f"page:{request.path}?{urlencode(args)}"
+
+def conditional_page(load_version, render, cache_key=None):
+    """Сторінка з ETag-валідатором; для анонімних відвідувачів — з кешу готових сторінок
+    
+    load_version() повертає валідатор з БД (рядок з updated_at), render() — HTML сторінки.
+    """
+    def build():
+        version = load_version()
+        return render(), page_etag(version, request.full_path), version['updated_at'] if version else None
+    
+    if cache_key:
+        html, etag, last_modified = page_cache.get_or_load(cache_key, build)
+        return not_modified(etag, last_modified) or with_validators(app.make_response(html), etag, last_modified)
+    
+    version = load_version()
+    etag = page_etag(version, request.full_path)
+    last_modified = version['updated_at'] if version else None
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+    return with_validators(app.make_response(render()), etag, last_modified)
+
+def with_validators(response, etag, last_modified=None):
+    """ETag/Last-Modified і вимога перевіряти версію при кожному зверненні"""
+    if etag:
+        response.set_etag(etag, weak=True)
+        if last_modified:
+            # TIMESTAMP повертається в часовому поясі сесії MySQL (за замовчуванням — системному)
+            response.last_modified = last_modified.astimezone(timezone.utc)
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 @app.route('/')
 def index():
     """Головна сторінка"""
     models = get_models()
-    events = models['event'].get_all(status='upcoming', limit=6)
-    categories = models['category'].get_all()
-    return render_template('index.html', events=events, categories=categories)
+    
+    def render():
+        events = models['event'].get_all(status='upcoming', limit=6)
+        categories = models['category'].get_all()
+        return render_template('index.html', events=events, categories=categories)
+    
+    return conditional_page(models['event'].get_listing_version, render, anonymous_page_key())
 
 @app.route('/register', methods=['GET', 'POST'])
 def register():
@@ -100,9 +325,19 @@ def register():
         else:
             flash('Помилка реєстрації', 'danger')
     
-    # Отримання списку університетів для autocomplete
-    universities = models['user'].get_universities()
-    return render_template('register.html', universities=universities)
+    # Підказки університетів завантажуються на вимогу через /api/universities
+    return render_template('register.html')
+
+@app.route('/api/universities')
+def university_suggestions():
+    """Автодоповнення університетів за префіксом (JSON)"""
+    models = get_models()
+    
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 20)
+    suggestions = models['user'].suggest_universities(request.args.get('q', ''), limit)
+    if suggestions is None:
+        return {'error': 'Database error'}, 500
+    return jsonify(suggestions)
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -140,10 +375,44 @@ def events():
     category_id = request.args.get('category')
     status = request.args.get('status', 'upcoming')
     
-    events = models['event'].get_all(status=status, category_id=category_id)
+    def render():
+        # Keyset-пагінація: ?after=<курсор> — наступна сторінка, ?before=<курсор> — попередня
+        before = request.args.get('before')
+        page = models['event'].get_page(
+            status=status, category_id=category_id,
+            cursor=before or request.args.get('after'),
+            direction='prev' if before else 'next',
+            per_page=app.config['ITEMS_PER_PAGE']
+        )
+        categories = models['category'].get_all()
+        return render_template('events.html', events=page['events'], categories=categories,
+                               selected_category=category_id, selected_status=status,
+                               next_cursor=page['next_cursor'], prev_cursor=page['prev_cursor'])
+    
+    # Повторний перегляд без змін у подіях — 304 після одного запиту версії
+    return conditional_page(models['event'].get_listing_version, render,
+                            anonymous_page_key('category', 'status', 'after', 'before'))
+
+@app.route('/events/search')
+def search_events():
+    """Повнотекстовий пошук подій"""
+    models = get_models()
+    
+    query = request.args.get('q', '').strip()
+    category_id = request.args.get('category')
+    status = request.args.get('status')
+    page = max(request.args.get('page', 1, type=int), 1)
+    
+    results = None
+    if query:
+        results = models['event'].search(query, status=status, category_id=category_id,
+                                         page=page, per_page=app.config['ITEMS_PER_PAGE'])
+    if results is None:
+        results = {'events': [], 'has_next': False}
     categories = models['category'].get_all()
     
-    return render_template('events.html', events=events, categories=categories, 
+    return render_template('search.html', events=results['events'], has_next=results['has_next'],
+                         page=page, query=query, categories=categories,
                          selected_category=category_id, selected_status=status)
 
 @app.route('/event/<int:event_id>')
@@ -151,21 +420,48 @@ def event_detail(event_id):
     """Деталі події"""
     models = get_models()
     
-    event = models['event'].get_by_id(event_id)
-    if not event:
+    version = models['event'].get_version(event_id, session.get('user_id'))
+    etag = page_etag(version, event_id)
+    last_modified = version['updated_at'] if version else None
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+    
+    # Подія, коментарі, рейтинг і реєстрація поточного користувача — одним зверненням до БД
+    detail = models['event'].load_detail(event_id, session.get('user_id'),
+                                         comments_per_page=app.config['COMMENTS_PER_PAGE'])
+    if not detail:
         flash('Подію не знайдено', 'danger')
         return redirect(url_for('events'))
     
-    comments = models['comment'].get_by_event(event_id)
-    rating_data = models['rating'].get_average(event_id)
+    registration = detail['registration']
+    is_registered = registration is not None and registration['status'] != 'cancelled'
     
-    is_registered = False
-    if 'user_id' in session:
-        registration = models['registration'].check_registration(event_id, session['user_id'])
-        is_registered = registration is not None and registration['status'] != 'cancelled'
+    response = app.make_response(render_template(
+        'event_detail.html', event=detail['event'], comments=detail['comments'],
+        comments_cursor=detail['comments_cursor'],
+        rating_data=detail['rating_data'], is_registered=is_registered))
+    return with_validators(response, etag, last_modified)
+
+@app.route('/event/<int:event_id>/comments')
+def event_comments(event_id):
+    """Наступна сторінка коментарів у JSON (кнопка «Завантажити ще»)"""
+    models = get_models()
     
-    return render_template('event_detail.html', event=event, comments=comments, 
-                         rating_data=rating_data, is_registered=is_registered)
+    page = models['comment'].get_page(event_id, cursor=request.args.get('before'),
+                                      per_page=app.config['COMMENTS_PER_PAGE'])
+    if page is None:
+        return {'error': 'Database error'}, 500
+    
+    return jsonify({
+        'comments': [{
+            'id': comment['id'],
+            'full_name': comment['full_name'],
+            'comment_text': comment['comment_text'],
+            'created_at': comment['created_at'].strftime('%d.%m.%Y %H:%M')
+        } for comment in page['comments']],
+        'next_cursor': page['next_cursor']
+    })
 
 @app.route('/event/<int:event_id>/register', methods=['POST'])
 @login_required
@@ -173,34 +469,20 @@ def register_for_event(event_id):
     """Реєстрація на подію"""
     models = get_models()
     
-    event = models['event'].get_by_id(event_id)
-    if not event:
-        flash('Подію не знайдено', 'danger')
-        return redirect(url_for('events'))
+    # Бронювання місця однією транзакцією (перевірка місць, створення або відновлення реєстрації)
+    result = models['registration'].reserve(event_id, session['user_id'])
     
-    # Перевірка чи вже зареєстрований
-    existing = models['registration'].check_registration(event_id, session['user_id'])
-    if existing and existing['status'] != 'cancelled':
+    if result == 'reserved':
+        flash('Ви успішно зареєструвалися на подію!', 'success')
+    elif result == 'already':
         flash('Ви вже зареєстровані на цю подію', 'warning')
-        return redirect(url_for('event_detail', event_id=event_id))
-    
-    # Перевірка кількості місць
-    if event['current_participants'] >= event['max_participants']:
+    elif result == 'full':
+        if not models['event'].get_by_id(event_id):
+            flash('Подію не знайдено', 'danger')
+            return redirect(url_for('events'))
         flash('Вибачте, всі місця зайняті', 'danger')
-        return redirect(url_for('event_detail', event_id=event_id))
-    
-    # Реєстрація (якщо є cancelled запис, відновлюємо його, інакше створюємо новий)
-    if existing and existing['status'] == 'cancelled':
-        # Відновлення скасованої реєстрації
-        success = models['registration'].update_status(existing['id'], 'registered')
-    else:
-        # Створення нової реєстрації
-        reg_id = models['registration'].create(event_id, session['user_id'])
-        success = reg_id is not None
-    
-    if success:
-        models['event'].increment_participants(event_id)
-        flash('Ви успішно зареєструвалися на подію!', 'success')
+    elif result == 'closed':
+        flash('Реєстрацію на цю подію закрито', 'warning')
     else:
         flash('Помилка реєстрації', 'danger')
     
@@ -212,8 +494,7 @@ def cancel_registration(event_id):
     """Скасування реєстрації на подію"""
     models = get_models()
     
-    if models['registration'].cancel(event_id, session['user_id']):
-        models['event'].decrement_participants(event_id)
+    if models['registration'].cancel_reservation(event_id, session['user_id']):
         flash('Реєстрацію скасовано', 'info')
     else:
         flash('Помилка скасування реєстрації', 'danger')
@@ -228,8 +509,10 @@ def add_comment(event_id):
     
     comment_text = request.form.get('comment_text')
     if comment_text:
-        models['comment'].create(event_id, session['user_id'], comment_text)
-        flash('Коментар додано', 'success')
+        if models['comment'].create(event_id, session['user_id'], comment_text):
+            flash('Коментар додано', 'success')
+        else:
+            flash('Не вдалося додати коментар, спробуйте ще раз', 'danger')
     
     return redirect(url_for('event_detail', event_id=event_id))
 
@@ -239,7 +522,7 @@ def profile():
     """Профіль користувача"""
     models = get_models()
     
-    user = models['user'].get_by_id(session['user_id'])
+    user = get_current_user()
     registrations = models['registration'].get_by_user(session['user_id'])
     
     return render_template('profile.html', user=user, registrations=registrations)
@@ -277,7 +560,8 @@ def create_event():
         
         event_id = models['event'].create(
             title, description, category_id, session['user_id'],
-            location, event_date, registration_deadline, max_participants
+            location, event_date, registration_deadline, max_participants,
+            is_online=is_online, online_link=online_link
         )
         
         if event_id:
@@ -302,13 +586,44 @@ def my_events():
         events = models['event'].get_by_organizer(session['user_id'])
     return render_template('my_events.html', events=events)
 
+@app.route('/dashboard')
+@organizer_required
+def dashboard():
+    """Панель організатора: реєстрації за статусами, заповненість і останні реєстрації"""
+    models = get_models()
+    
+    # Адміністратор бачить усі події
+    organizer_id = None if session.get('role') == 'admin' else session['user_id']
+    before = request.args.get('before')
+    page = models['event'].get_dashboard_page(
+        organizer_id,
+        cursor=before or request.args.get('after'),
+        direction='prev' if before else 'next',
+        per_page=app.config['ITEMS_PER_PAGE']
+    )
+    if page is None:
+        page = {'events': [], 'next_cursor': None, 'prev_cursor': None}
+    totals = models['event'].get_dashboard_totals(organizer_id)
+    recent = models['registration'].get_recent(organizer_id) or []
+    
+    return render_template('dashboard.html', events=page['events'], totals=totals, recent=recent,
+                         registration_statuses=REGISTRATION_STATUS_TRANSLATIONS,
+                         next_cursor=page['next_cursor'], prev_cursor=page['prev_cursor'])
+
+async def load_event_form(event_id):
+    """Подія та категорії для форми редагування — одночасно"""
+    read_models = get_async_models()
+    return await asyncio.gather(read_models['event'].get_by_id(event_id), read_models['category'].get_all())
+
 @app.route('/event/<int:event_id>/edit', methods=['GET', 'POST'])
 @organizer_required
 def edit_event(event_id):
     """Редагування події"""
     models = get_models()
     
-    event = models['event'].get_by_id(event_id)
+    # Представлення синхронне: запис іде через з'єднання потоку запиту, яке звільняє teardown,
+    # і позначка запису для реплік лишається в цьому потоці. Асинхронні лише читання форми
+    event, categories = app.async_to_sync(load_event_form)(event_id)
     if not event or (event['organizer_id'] != session['user_id'] and session.get('role') != 'admin'):
         flash('Подію не знайдено або у вас немає прав', 'danger')
         return redirect(url_for('my_events'))
@@ -331,13 +646,29 @@ def edit_event(event_id):
         else:
             flash('Помилка оновлення події', 'danger')
     
-    categories = models['category'].get_all()
     return render_template('edit_event.html', event=event, categories=categories)
 
 @app.route('/event/<int:event_id>/participants')
 @organizer_required
-def event_participants(event_id):
+async def event_participants(event_id):
     """Список учасників події"""
+    models = get_async_models()
+    
+    # Персональні дані учасників читаються лише після перевірки прав на подію
+    event = await models['event'].get_by_id(event_id)
+    if not event or (event['organizer_id'] != session['user_id'] and session.get('role') != 'admin'):
+        flash('Подію не знайдено або у вас немає прав', 'danger')
+        return redirect(url_for('events'))
+    participants = await models['registration'].get_by_event(event_id)
+    
+    return render_template('participants.html', event=event, participants=participants)
+
+PARTICIPANT_EXPORT_HEADER = ["Ім'я", 'Email', 'Університет', 'Дата реєстрації', 'Статус']
+
+@app.route('/event/<int:event_id>/participants/export')
+@organizer_required
+def export_participants(event_id):
+    """Потоковий експорт учасників події у CSV або XLSX"""
     models = get_models()
     
     event = models['event'].get_by_id(event_id)
@@ -345,8 +676,27 @@ def event_participants(event_id):
         flash('Подію не знайдено або у вас немає прав', 'danger')
         return redirect(url_for('events'))
     
-    participants = models['registration'].get_by_event(event_id)
-    return render_template('participants.html', event=event, participants=participants)
+    file_format = request.args.get('format', 'csv')
+    rows = (
+        (row['full_name'], row['email'], row['university'], row['registration_date'],
+         REGISTRATION_STATUS_TRANSLATIONS.get(row['status'], row['status']))
+        for row in models['registration'].stream_by_event(event_id)
+    )
+    
+    if file_format == 'xlsx':
+        body = stream_xlsx(PARTICIPANT_EXPORT_HEADER, rows, sheet_name='Учасники')
+        mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    else:
+        file_format = 'csv'
+        body = stream_csv(PARTICIPANT_EXPORT_HEADER, rows)
+        mimetype = 'text/csv; charset=utf-8'
+    
+    # З'єднання запиту більше не потрібне: експорт читає через власне, і тримати обидва
+    # до кінця завантаження означало б займати два місця в пулі
+    db.release()
+    return Response(stream_with_context(body), mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename=participants-{event_id}.{file_format}'
+    })
 
 
 @app.route('/event/<int:event_id>/delete', methods=['POST'])
@@ -391,30 +741,97 @@ def add_participant(event_id):
         flash('Користувача з таким email не знайдено', 'danger')
         return redirect(url_for('event_participants', event_id=event_id))
 
-    existing = models['registration'].check_registration(event_id, user['id'])
-    if existing and existing['status'] != 'cancelled':
+    # Організатор може додати учасника і після дедлайну реєстрації
+    result = models['registration'].reserve(event_id, user['id'], enforce_deadline=False)
+    if result == 'reserved':
+        flash('Учасника додано', 'success')
+    elif result == 'already':
         flash('Користувач вже доданий до цієї події', 'info')
-        return redirect(url_for('event_participants', event_id=event_id))
-
-    if event['current_participants'] >= event['max_participants']:
+    elif result == 'full':
         flash('Всі місця вже зайняті', 'warning')
-        return redirect(url_for('event_participants', event_id=event_id))
-
-    if existing and existing['status'] == 'cancelled':
-        success = models['registration'].update_status(existing['id'], 'registered')
-    else:
-        reg_id = models['registration'].create(event_id, user['id'])
-        success = reg_id is not None
-
-    if success:
-        models['event'].increment_participants(event_id)
-        flash('Учасника додано', 'success')
     else:
         flash('Не вдалося додати учасника', 'danger')
 
     return redirect(url_for('event_participants', event_id=event_id))
 
 
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+IMPORT_RESULT_MESSAGES = {
+    'added': 'Додано',
+    'reactivated': 'Реєстрацію відновлено',
+    'already': 'Вже зареєстрований',
+    'full': 'Немає вільних місць',
+    'not_found': 'Користувача не знайдено',
+    'invalid': 'Некоректний email'
+}
+
+def parse_email_list(text, upload=None):
+    """Email-адреси з вставленого тексту та/або CSV-файлу (перша колонка з '@') без повторів без урахування регістру"""
+    emails = [item for item in re.split(r'[\s,;]+', text or '') if item]
+    
+    if upload and upload.filename:
+        content = io.StringIO(upload.read().decode('utf-8-sig', errors='replace'))
+        for row in csv.reader(content):
+            email = next((cell.strip() for cell in row if '@' in cell), None)
+            if email:
+                emails.append(email)
+    
+    # Адреси, що відрізняються лише регістром, належать одному користувачу
+    unique = {}
+    for email in emails:
+        unique.setdefault(email.strip().lower(), email.strip())
+    return list(unique.values())
+
+@app.route('/event/<int:event_id>/participants/import', methods=['POST'])
+@organizer_required
+def import_participants(event_id):
+    """Пакетне додавання учасників за списком email або CSV-файлом"""
+    models = get_models()
+    
+    event = models['event'].get_by_id(event_id)
+    if not event or (event['organizer_id'] != session['user_id'] and session.get('role') != 'admin'):
+        flash('Подію не знайдено або у вас немає прав', 'danger')
+        return redirect(url_for('events'))
+    
+    emails = parse_email_list(request.form.get('emails'), request.files.get('file'))
+    if not emails:
+        flash('Вкажіть email-адреси або завантажте CSV-файл', 'warning')
+        return redirect(url_for('event_participants', event_id=event_id))
+    if len(emails) > app.config['IMPORT_MAX_ROWS']:
+        flash(f'Забагато адрес: максимум {app.config["IMPORT_MAX_ROWS"]} за один імпорт', 'warning')
+        return redirect(url_for('event_participants', event_id=event_id))
+    
+    valid = [email for email in emails if EMAIL_PATTERN.match(email)]
+    users = models['user'].get_by_emails(valid)
+    results = None
+    if users is not None:
+        # Місця розподіляються в порядку вхідного списку, а не в порядку рядків з БД
+        user_ids = [users[email.lower()]['id'] for email in valid if email.lower() in users]
+        results = models['registration'].bulk_reserve(event_id, user_ids)
+    if results is None:
+        flash('Не вдалося імпортувати учасників', 'danger')
+        return redirect(url_for('event_participants', event_id=event_id))
+    
+    report = []
+    for email in emails:
+        user = users.get(email.lower())
+        if not EMAIL_PATTERN.match(email):
+            result = 'invalid'
+        elif user is None:
+            result = 'not_found'
+        else:
+            result = results[user['id']]
+        report.append({'email': email, 'result': result, 'message': IMPORT_RESULT_MESSAGES[result]})
+    
+    added = sum(1 for row in report if row['result'] in ('added', 'reactivated'))
+    flash(f'Імпорт завершено: додано {added} з {len(report)}', 'success' if added else 'info')
+    
+    event = models['event'].get_by_id(event_id)
+    participants = models['registration'].get_by_event(event_id)
+    return render_template('participants.html', event=event, participants=participants, import_report=report)
+
+
 @app.route('/event/<int:event_id>/participants/<int:user_id>/remove', methods=['POST'])
 @organizer_required
 def remove_participant(event_id, user_id):
@@ -431,8 +848,7 @@ def remove_participant(event_id, user_id):
         flash('Цей учасник вже не активний у події', 'info')
         return redirect(url_for('event_participants', event_id=event_id))
 
-    if models['registration'].cancel(event_id, user_id):
-        models['event'].decrement_participants(event_id)
+    if models['registration'].cancel_reservation(event_id, user_id):
         flash('Учасника видалено', 'success')
     else:
         flash('Не вдалося видалити учасника', 'danger')
@@ -447,14 +863,27 @@ def users_list():
         return redirect(url_for('login'))
     
     models = get_models()
-    current_user = models['user'].get_by_id(session.get('user_id'))
+    current_user = get_current_user()
     
-    if current_user['role'] != 'admin':
+    if not current_user or current_user['role'] != 'admin':
         flash('Доступ заборонений', 'danger')
         return redirect(url_for('index'))
     
-    all_users = models['user'].get_all()
-    return render_template('users.html', users=all_users)
+    search = request.args.get('q', '').strip()
+    field = request.args.get('field') or 'full_name'
+    role = request.args.get('role') or None
+    before = request.args.get('before')
+    page = models['user'].get_page(
+        search=search or None, role=role, field=field,
+        cursor=before or request.args.get('after'),
+        direction='prev' if before else 'next',
+        per_page=app.config['USERS_PER_PAGE']
+    )
+    if page is None:
+        page = {'users': [], 'next_cursor': None, 'prev_cursor': None}
+    
+    return render_template('users.html', users=page['users'], search=search, search_field=field, selected_role=role,
+                         next_cursor=page['next_cursor'], prev_cursor=page['prev_cursor'])
 
 @app.route('/user/<int:user_id>/role', methods=['POST'])
 def change_user_role(user_id):
@@ -463,9 +892,9 @@ def change_user_role(user_id):
         return {'error': 'Unauthorized'}, 401
     
     models = get_models()
-    current_user = models['user'].get_by_id(session.get('user_id'))
+    current_user = get_current_user()
     
-    if current_user['role'] != 'admin':
+    if not current_user or current_user['role'] != 'admin':
         return {'error': 'Forbidden'}, 403
     
     new_role = request.form.get('role')
@@ -485,9 +914,9 @@ def edit_user(user_id):
         return redirect(url_for('login'))
     
     models = get_models()
-    current_user = models['user'].get_by_id(session.get('user_id'))
+    current_user = get_current_user()
     
-    if current_user['role'] != 'admin':
+    if not current_user or current_user['role'] != 'admin':
         flash('Доступ заборонений', 'danger')
         return redirect(url_for('index'))
     
@@ -510,6 +939,67 @@ def edit_user(user_id):
     
     return render_template('edit_user.html', user=user)
 
+@app.cli.command('rebuild-ratings')
+def rebuild_ratings_command():
+    """Перерахунок збережених агрегатів оцінок подій: flask --app app rebuild-ratings"""
+    max_id = get_models()['rating'].rebuild_aggregates()
+    if max_id is None:
+        print('Не вдалося перерахувати рейтинги')
+    else:
+        print(f'Рейтинги перераховано для подій з id до {max_id}')
+
+@app.cli.command('rebuild-comment-counts')
+def rebuild_comment_counts_command():
+    """Перерахунок збережених лічильників коментарів: flask --app app rebuild-comment-counts"""
+    max_id = get_models()['comment'].rebuild_counts()
+    if max_id is None:
+        print('Не вдалося перерахувати лічильники коментарів')
+    else:
+        print(f'Лічильники коментарів перераховано для подій з id до {max_id}')
+
+@app.cli.command('rebuild-registration-stats')
+def rebuild_registration_stats_command():
+    """Перерахунок лічильників реєстрацій для панелі організатора: flask --app app rebuild-registration-stats"""
+    max_id = get_models()['registration'].rebuild_stats()
+    if max_id is None:
+        print('Не вдалося перерахувати лічильники реєстрацій')
+    else:
+        print(f'Лічильники реєстрацій перераховано для подій з id до {max_id}')
+
+@app.cli.command('advance-event-statuses')
+def advance_event_statuses_command():
+    """Одноразовий прохід планувальника статусів подій: flask --app app advance-event-statuses"""
+    counts = status_scheduler.run_once()
+    if counts is None:
+        print('Не вдалося оновити статуси подій')
+    else:
+        print(f"Реєстрацію закрито: {counts['registration_closed']}, розпочалися: {counts['ongoing']}, "
+              f"завершилися: {counts['completed']}")
+
+@app.cli.command('migrate')
+@click.option('--dry-run', is_flag=True, help='Лише показати міграції, що будуть застосовані')
+def migrate_command(dry_run):
+    """Застосування нових міграцій схеми: flask --app app migrate [--dry-run]"""
+    applied = migrate(db, dry_run=dry_run)
+    if not applied:
+        print('Схема актуальна')
+    for version, name in applied:
+        print(f"{'Буде застосовано' if dry_run else 'Застосовано'}: {version:04d}_{name}")
+
+@app.cli.command('check-query-plans')
+def check_query_plans_command():
+    """EXPLAIN гарячих запитів; код виходу 1 при повному скануванні або filesort"""
+    failures = check_query_plans(db)
+    if failures:
+        print(f"\nПроблемних планів: {len(failures)}")
+        for name, table, problems, statement in failures:
+            print(f"  {name} [{table}]: {', '.join(problems)}\n    {statement}")
+        raise SystemExit(1)
+    print('\nУсі гарячі запити використовують індекси')
+
 if __name__ == '__main__':
     init_db()
+    # Планувальник — лише в процесі сервера: у батьківському процесі reloader-а та в командах flask він не потрібен
+    if app.config['EVENT_SCHEDULER_ENABLED'] and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        status_scheduler.start()
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,224 @@
+"""Асинхронний шар моделей для async-представлень Flask.
+
+Незалежні запити сторінки (подія й категорії форми редагування) виконуються одночасно
+через asyncio.gather на різних з'єднаннях пулу aiomysql, тому час сторінки дорівнює
+найдовшому запиту, а не сумі. Flask запускає кожне async-представлення у власному циклі подій,
+тож пули живуть в окремому потоці зі своїм циклом, а запити передаються туди через
+run_coroutine_threadsafe: з'єднання переживають запит, а один потік тримає багато запитів до БД.
+
+Методи виконують ті самі запити, що й однойменні методи models.py (спільні константи), і лише
+читають: записи та транзакції лишаються в синхронному шарі. Читання розподіляються між
+репліками за тими самими правилами, що й у Database (MYSQL_REPLICAS, закріплення після запису).
+"""
+import asyncio
+import os
+import threading
+import time
+
+import aiomysql
+
+from models import (cache, _comment_page, _comment_page_query, USER_BY_ID_QUERY, EVENT_BY_ID_QUERY,
+                    EVENTS_BY_ORGANIZER_QUERY, REGISTRATIONS_BY_USER_QUERY, REGISTRATIONS_BY_EVENT_QUERY,
+                    REGISTRATION_CHECK_QUERY, CATEGORIES_QUERY, RATING_AVERAGE_QUERY)
+
+
+class AsyncDatabase:
+    """Пули aiomysql у фоновому циклі подій; маршрутизація й облік запитів — через синхронний Database"""
+
+    def __init__(self, db, pool_size=None):
+        self.db = db
+        self.config = db.config
+        self.pool_size = pool_size or self.config.ASYNC_DB_POOL_SIZE
+        self._loop = None
+        # Пули за сервером: None — основний, (host, port) — репліка
+        self._pools = {}
+        self._replica_cursor = 0
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _get_loop(self):
+        """Цикл подій пулів (запускається при першому запиті, заново — після fork)"""
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                self._loop = asyncio.new_event_loop()
+                self._pools = {}
+                self._pid = os.getpid()
+                threading.Thread(target=self._loop.run_forever, name='async-db', daemon=True).start()
+            return self._loop
+
+    def _get_pool(self, server=None):
+        """Ліниве створення пулу сервера (лише в циклі пулів; одночасні виклики чекають на одне створення)"""
+        if server not in self._pools:
+            host, port = server or (self.config.MYSQL_HOST, self.config.MYSQL_PORT)
+            self._pools[server] = asyncio.ensure_future(aiomysql.create_pool(
+                host=host,
+                user=self.config.MYSQL_USER,
+                password=self.config.MYSQL_PASSWORD,
+                db=self.config.MYSQL_DB,
+                port=port,
+                charset='utf8mb4',
+                autocommit=True,
+                minsize=1,
+                maxsize=self.pool_size
+            ))
+        return self._pools[server]
+
+    def _read_server(self):
+        """Репліка для читання (по колу) або None — основний сервер, як у Database.get_read_connection"""
+        if not self.db._reads_from_replica():
+            return None
+        with self._lock:
+            self._replica_cursor = (self._replica_cursor + 1) % len(self.db.replicas)
+            return self.db.replicas[self._replica_cursor]
+
+    async def _acquire(self, server, read):
+        """Пул і з'єднання сервера; недоступна репліка замінюється основним сервером"""
+        pending = self._get_pool(server)
+        try:
+            pool = await pending
+            connection = await pool.acquire()
+        except aiomysql.Error as err:
+            if pending.done() and self._pools.get(server) is pending:
+                # Пул не створено (сервер недоступний): наступний запит спробує знову
+                del self._pools[server]
+            if server is None:
+                raise
+            print(f"Репліка недоступна, читання з основного сервера: {err}")
+            self.db._count_read('replica_failures')
+            return await self._acquire(None, read)
+        if read:
+            self.db._count_read('replica_reads' if server else 'primary_reads')
+        return pool, connection
+
+    async def _execute(self, query, params, fetch, server):
+        pool, connection = await self._acquire(server, fetch)
+        try:
+            async with connection.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(query, params or ())
+                return await cursor.fetchall() if fetch else cursor.lastrowid
+        finally:
+            pool.release(connection)
+
+    async def execute_query(self, query, params=None, fetch=False):
+        """Виконання SQL запиту в пулі; None при помилці, як у Database.execute_query"""
+        started = time.perf_counter()
+        # Сервер обирається в контексті HTTP-запиту: там видно закріплення за основним сервером
+        server = self._read_server() if fetch else None
+        future = asyncio.run_coroutine_threadsafe(self._execute(query, params, fetch, server), self._get_loop())
+        try:
+            result = await asyncio.wrap_future(future)
+            return list(result) if fetch else result
+        except aiomysql.Error as err:
+            print(f"Помилка виконання запиту: {err}")
+            return None
+        finally:
+            # Облік у контексті HTTP-запиту: статистика сторінки, метрики, журнал повільних запитів
+            self.db._record_query(query, params, time.perf_counter() - started)
+
+    async def _close_pools(self):
+        pools, self._pools = self._pools, {}
+        for pending in pools.values():
+            try:
+                pool = await pending
+            except aiomysql.Error:
+                continue
+            pool.close()
+            await pool.wait_closed()
+
+    def close(self):
+        """Закриття пулів та зупинка циклу подій"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None and self._pid == os.getpid():
+            asyncio.run_coroutine_threadsafe(self._close_pools(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+
+
+class User:
+    """Асинхронна модель користувача"""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def get_by_id(self, user_id):
+        """Отримання користувача за ID"""
+        result = await self.db.execute_query(USER_BY_ID_QUERY, (user_id,), fetch=True)
+        return result[0] if result else None
+
+
+class Event:
+    """Асинхронна модель події"""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def get_by_id(self, event_id):
+        """Отримання події за ID"""
+        result = await self.db.execute_query(EVENT_BY_ID_QUERY, (event_id,), fetch=True)
+        return result[0] if result else None
+
+    async def get_by_organizer(self, organizer_id):
+        """Отримання подій організатора"""
+        return await self.db.execute_query(EVENTS_BY_ORGANIZER_QUERY, (organizer_id,), fetch=True)
+
+
+class Registration:
+    """Асинхронна модель реєстрації"""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def get_by_user(self, user_id):
+        """Отримання реєстрацій користувача"""
+        return await self.db.execute_query(REGISTRATIONS_BY_USER_QUERY, (user_id,), fetch=True)
+
+    async def get_by_event(self, event_id):
+        """Отримання реєстрацій на подію"""
+        return await self.db.execute_query(REGISTRATIONS_BY_EVENT_QUERY, (event_id,), fetch=True)
+
+    async def check_registration(self, event_id, user_id):
+        """Перевірка чи зареєстрований користувач"""
+        result = await self.db.execute_query(REGISTRATION_CHECK_QUERY, (event_id, user_id), fetch=True)
+        return result[0] if result else None
+
+
+class Category:
+    """Асинхронна модель категорії"""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def get_all(self):
+        """Отримання всіх категорій (спільний кеш із синхронною моделлю)"""
+        categories, found = cache.get('categories:all')
+        if not found:
+            categories = await self.db.execute_query(CATEGORIES_QUERY, fetch=True)
+            cache.set('categories:all', categories)
+        return categories
+
+
+class Comment:
+    """Асинхронна модель коментаря"""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def get_page(self, event_id, cursor=None, per_page=20):
+        """Сторінка коментарів від новіших до старіших (keyset за (created_at, id))"""
+        query, params = _comment_page_query(event_id, cursor, per_page)
+        comments = await self.db.execute_query(query, params, fetch=True)
+        if comments is None:
+            return None
+        return _comment_page(comments, per_page)
+
+
+class Rating:
+    """Асинхронна модель оцінки"""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def get_average(self, event_id):
+        """Отримання середньої оцінки події"""
+        result = await self.db.execute_query(RATING_AVERAGE_QUERY, (event_id,), fetch=True)
+        return result[0] if result else {'avg_rating': 0, 'count': 0}
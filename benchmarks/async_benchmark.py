@@ -0,0 +1,115 @@
+"""Послідовні запити сторінки проти одночасних (async_models + asyncio.gather).
+
+Сторінка — чотири незалежні читання (подія, учасники, оцінка, перша сторінка коментарів).
+Спершу вимірюється затримка однієї сторінки, потім пропускна здатність одного потоку,
+коли асинхронний шар тримає в польоті --inflight сторінок одночасно. --sleep-ms додає до сторінки
+запит SELECT SLEEP(...), що імітує повільну БД або мережу.
+
+Запуск (потрібна локальна MySQL з даними):
+    python -m benchmarks.async_benchmark --event-id 1 --iterations 500 --inflight 16 --sleep-ms 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import async_models
+from models import Database, Event, Registration, Rating, Comment
+
+
+def sync_page(db, event_id, sleep):
+    """Синхронний шлях: запити один за одним"""
+    result = (Event(db).get_by_id(event_id), Registration(db).get_by_event(event_id),
+              Rating(db).get_average(event_id), Comment(db).get_page(event_id))
+    if sleep:
+        db.execute_query("SELECT SLEEP(%s) as slept", (sleep,), fetch=True)
+    return result
+
+
+async def async_page(adb, event_id, sleep):
+    """Асинхронний шлях: усі запити сторінки одночасно"""
+    reads = [async_models.Event(adb).get_by_id(event_id), async_models.Registration(adb).get_by_event(event_id),
+             async_models.Rating(adb).get_average(event_id), async_models.Comment(adb).get_page(event_id)]
+    if sleep:
+        reads.append(adb.execute_query("SELECT SLEEP(%s) as slept", (sleep,), fetch=True))
+    return await asyncio.gather(*reads)
+
+
+def report(name, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{name:<16} середнє {statistics.mean(timings):.3f} мс, "
+          f"p50 {statistics.median(timings):.3f} мс, p95 {p95:.3f} мс")
+
+
+def measure_sync(db, event_id, sleep, iterations):
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        sync_page(db, event_id, sleep)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def measure_async(adb, event_id, sleep, iterations):
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await async_page(adb, event_id, sleep)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def throughput_async(adb, event_id, sleep, iterations, inflight):
+    """Сторінок за секунду, коли один потік тримає inflight сторінок у польоті"""
+    remaining = iterations
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await async_page(adb, event_id, sleep)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(inflight)))
+    return iterations / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк асинхронного шару моделей')
+    parser.add_argument('--event-id', type=int, default=1)
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--inflight', type=int, default=16, help='сторінок одночасно в одному потоці')
+    parser.add_argument('--sleep-ms', type=float, default=0, help='імітація повільного запиту на сторінку')
+    args = parser.parse_args()
+    sleep = args.sleep_ms / 1000
+
+    db = Database(pool_size=1)
+    if not Event(db).get_by_id(args.event_id):
+        raise SystemExit(f"Подію {args.event_id} не знайдено")
+    adb = async_models.AsyncDatabase(db, pool_size=5 * args.inflight)
+
+    async def run_async():
+        # Прогрів пулу
+        await throughput_async(adb, args.event_id, sleep, args.inflight * 2, args.inflight)
+        timings = await measure_async(adb, args.event_id, sleep, args.iterations)
+        rate = await throughput_async(adb, args.event_id, sleep, args.iterations, args.inflight)
+        return timings, rate
+
+    try:
+        measure_sync(db, args.event_id, sleep, 20)
+        started = time.perf_counter()
+        sync_timings = measure_sync(db, args.event_id, sleep, args.iterations)
+        sync_rate = args.iterations / (time.perf_counter() - started)
+        async_timings, async_rate = asyncio.run(run_async())
+
+        report('sync', sync_timings)
+        report('async gather', async_timings)
+        print(f"Один потік: sync {sync_rate:.1f} сторінок/с, async ({args.inflight} у польоті) {async_rate:.1f} сторінок/с")
+    finally:
+        adb.close()
+        db.disconnect()
+
+
+if __name__ == '__main__':
+    main()
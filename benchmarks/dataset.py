@@ -0,0 +1,360 @@
+"""Генератор синтетичного набору даних для бенчмарків і тестів на масштаб.
+
+Генерує користувачів, події, реєстрації, коментарі та оцінки з дотриманням усіх
+зовнішніх і унікальних ключів схеми та завантажує їх пакетно:
+    executemany — багаторядкові INSERT пакетами по --batch-size рядків;
+    infile      — LOAD DATA LOCAL INFILE з тимчасових TSV-файлів (потрібно local_infile=ON на сервері).
+Лічильники подій (учасники, оцінки, коментарі) перераховуються після завантаження.
+
+Усі згенеровані користувачі мають email у домені bench.unimeet і пароль "benchmark",
+тому набір можна безпечно видалити (події та пов'язані записи видаляються каскадно).
+Використовуйте окрему базу даних (MYSQL_DB).
+
+Запуск:
+    python -m benchmarks.dataset --users 100000 --events 20000 --registrations 1000000 \\
+        --comments 200000 --ratings 300000 --loader infile --clear
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import mysql.connector
+from werkzeug.security import generate_password_hash
+
+from config import Config
+
+BENCH_DOMAIN = 'bench.unimeet'
+PASSWORD = 'benchmark'
+BATCH_SIZE = 5000
+
+FIRST_NAMES = ['Олена', 'Андрій', 'Марія', 'Іван', 'Софія', 'Дмитро', 'Анна', 'Максим', 'Юлія', 'Олег']
+LAST_NAMES = ['Коваленко', 'Шевченко', 'Бондаренко', 'Ткаченко', 'Мельник', 'Кравчук', 'Олійник', 'Лисенко']
+UNIVERSITIES = [
+    'Київський національний університет імені Тараса Шевченка',
+    'Львівський національний університет імені Івана Франка',
+    'Харківський національний університет імені В.Н. Каразіна',
+    'Одеський національний університет імені І.І. Мечникова',
+    'Національний університет "Львівська політехніка"',
+]
+TOPICS = ['Python', 'машинне навчання', 'кібербезпека', 'дизайн', 'стартапи', 'робототехніка',
+          'економіка', 'історія', 'музика', 'футбол', 'волонтерство', 'кар\'єра в IT']
+FORMATS = ['Конференція з', 'Семінар:', 'Хакатон', 'Воркшоп', 'Лекція про', 'Зустріч клубу']
+LOCATIONS = ['Головний корпус, ауд. 101', 'Бібліотека, зала 2', 'Онлайн', 'Актова зала', 'Коворкінг']
+COMMENTS = ['Дуже цікаво!', 'Чи буде запис?', 'Дякую організаторам', 'Де саме збираємось?',
+            'Чекаю з нетерпінням', 'Чи потрібен ноутбук?', 'Було корисно', 'Скиньте, будь ласка, слайди']
+
+USER_COLUMNS = ('username', 'email', 'password_hash', 'full_name', 'role', 'university')
+EVENT_COLUMNS = ('title', 'description', 'category_id', 'organizer_id', 'location',
+                 'event_date', 'registration_deadline', 'max_participants', 'status')
+REGISTRATION_COLUMNS = ('event_id', 'user_id', 'registration_date', 'status')
+COMMENT_COLUMNS = ('event_id', 'user_id', 'comment_text', 'created_at')
+RATING_COLUMNS = ('event_id', 'user_id', 'rating', 'review', 'created_at')
+
+
+def bench_email(index):
+    return f'user{index}@{BENCH_DOMAIN}'
+
+
+def connect(local_infile=False):
+    """Окреме з'єднання для завантаження (з дозволом LOAD DATA LOCAL за потреби)"""
+    config = Config()
+    return mysql.connector.connect(
+        host=config.MYSQL_HOST, user=config.MYSQL_USER, password=config.MYSQL_PASSWORD,
+        database=config.MYSQL_DB, port=config.MYSQL_PORT, allow_local_infile=local_infile
+    )
+
+
+class ExecutemanyLoader:
+    """Пакетні багаторядкові INSERT з комітом після кожного пакета"""
+
+    def __init__(self, connection, batch_size=BATCH_SIZE):
+        self.connection = connection
+        self.batch_size = batch_size
+
+    def load(self, table, columns, rows):
+        placeholders = ', '.join(['%s'] * len(columns))
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        cursor = self.connection.cursor()
+        total = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                cursor.executemany(query, batch)
+                self.connection.commit()
+                total += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(query, batch)
+            self.connection.commit()
+            total += len(batch)
+        cursor.close()
+        return total
+
+
+class InfileLoader:
+    """LOAD DATA LOCAL INFILE з тимчасових TSV-файлів по chunk_size рядків"""
+
+    def __init__(self, connection, chunk_size=200000):
+        self.connection = connection
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def _field(value):
+        if value is None:
+            return '\\N'
+        if isinstance(value, datetime):
+            return value.strftime('%Y-%m-%d %H:%M:%S')
+        return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+    def _flush(self, table, columns, path, count):
+        cursor = self.connection.cursor()
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({', '.join(columns)})",
+            (path,)
+        )
+        self.connection.commit()
+        cursor.close()
+        return count
+
+    def load(self, table, columns, rows):
+        total = 0
+        handle, path = tempfile.mkstemp(suffix='.tsv')
+        os.close(handle)
+        try:
+            out = open(path, 'w', encoding='utf-8', newline='')
+            count = 0
+            for row in rows:
+                out.write('\t'.join(self._field(value) for value in row) + '\n')
+                count += 1
+                if count >= self.chunk_size:
+                    out.close()
+                    total += self._flush(table, columns, path, count)
+                    out = open(path, 'w', encoding='utf-8', newline='')
+                    count = 0
+            out.close()
+            if count:
+                total += self._flush(table, columns, path, count)
+        finally:
+            os.remove(path)
+        return total
+
+
+def _timed(label, loader, table, columns, rows):
+    started = time.perf_counter()
+    count = loader.load(table, columns, rows)
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed else 0
+    print(f"  {label:<14}{count:>10} рядків за {elapsed:7.1f} с ({rate:,.0f} рядків/с)")
+    return count
+
+
+def _fetch(connection, query, params=()):
+    cursor = connection.cursor()
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+def clear(db):
+    """Видалення згенерованого набору"""
+    with db.transaction() as cursor:
+        cursor.execute("DELETE FROM users WHERE email LIKE %s", (f'%@{BENCH_DOMAIN}',))
+        return cursor.rowcount
+
+
+def load_ids(db):
+    """Ідентифікатори вже згенерованих користувачів, організаторів і подій"""
+    users = db.execute_query(
+        "SELECT id, role FROM users WHERE email LIKE %s ORDER BY id", (f'%@{BENCH_DOMAIN}',), fetch=True
+    ) or []
+    events = db.execute_query("""
+        SELECT e.id FROM events e
+        JOIN users u ON u.id = e.organizer_id
+        WHERE u.email LIKE %s
+        ORDER BY e.id
+    """, (f'%@{BENCH_DOMAIN}',), fetch=True) or []
+    return {
+        'users': [user['id'] for user in users],
+        'students': [user['id'] for user in users if user['role'] == 'student'],
+        'organizers': [user['id'] for user in users if user['role'] == 'organizer'],
+        'events': [event['id'] for event in events],
+    }
+
+
+def _user_rows(rnd, users, organizer_count):
+    password_hash = generate_password_hash(PASSWORD)
+    for i in range(users):
+        yield (f'bench_user{i}', bench_email(i), password_hash,
+               f'{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}',
+               'organizer' if i < organizer_count else 'student', rnd.choice(UNIVERSITIES))
+
+
+def _event_rows(rnd, events, organizers, categories, now):
+    for _ in range(events):
+        event_date = now + timedelta(days=rnd.randint(-365, 365), hours=rnd.randint(8, 20))
+        topic = rnd.choice(TOPICS)
+        yield (f'{rnd.choice(FORMATS)} {topic}',
+               f'Подія для студентів, які цікавляться темою «{topic}». ' * 5,
+               rnd.choice(categories) if categories else None, rnd.choice(organizers),
+               rnd.choice(LOCATIONS), event_date, event_date - timedelta(days=1),
+               rnd.choice([30, 50, 100, 200, 500]), 'upcoming' if event_date > now else 'completed')
+
+
+def _per_event_samples(rnd, event_rows, students, total):
+    """Для кожної події — різні користувачі (унікальність (event_id, user_id))"""
+    if not event_rows or not students:
+        return
+    mean = total / len(event_rows)
+    remaining = total
+    for index, (event_id, event_date, status) in enumerate(event_rows):
+        if index == len(event_rows) - 1:
+            k = min(len(students), remaining)
+        else:
+            k = min(len(students), remaining, max(0, round(rnd.gauss(mean, mean / 3))))
+        remaining -= k
+        yield event_id, event_date, status, rnd.sample(students, k)
+
+
+def seed(db, users=1000, events=200, registrations=5000, comments=0, ratings=0,
+         organizer_share=0.05, seed=42, loader='executemany', batch_size=BATCH_SIZE):
+    """Генерація та пакетне завантаження набору; повертає словник ідентифікаторів"""
+    rnd = random.Random(seed)
+    connection = connect(local_infile=loader == 'infile')
+    cursor = connection.cursor()
+    # Посилання між рядками гарантуються генератором, тож перевірку зовнішніх ключів вимикаємо.
+    # Унікальність лишається: повторний запуск без --clear має впасти, а не додати дублікати email
+    cursor.execute("SET SESSION foreign_key_checks = 0")
+    cursor.close()
+    bulk = InfileLoader(connection) if loader == 'infile' else ExecutemanyLoader(connection, batch_size)
+    now = datetime.now().replace(microsecond=0)
+
+    try:
+        organizer_count = max(1, int(users * organizer_share))
+        _timed('users', bulk, 'users', USER_COLUMNS, _user_rows(rnd, users, organizer_count))
+
+        rows = _fetch(connection, "SELECT id, role FROM users WHERE email LIKE %s ORDER BY id",
+                      (f'%@{BENCH_DOMAIN}',))
+        organizers = [row[0] for row in rows if row[1] == 'organizer']
+        students = [row[0] for row in rows if row[1] == 'student']
+        categories = [row[0] for row in _fetch(connection, "SELECT id FROM event_categories")]
+        _timed('events', bulk, 'events', EVENT_COLUMNS,
+               _event_rows(rnd, events, organizers, categories, now))
+
+        event_rows = _fetch(connection, """
+            SELECT e.id, e.event_date, e.status FROM events e
+            JOIN users u ON u.id = e.organizer_id
+            WHERE u.email LIKE %s ORDER BY e.id
+        """, (f'%@{BENCH_DOMAIN}',))
+
+        # Оцінки ставлять лише учасники завершених подій; пари (подія, користувач) беруться з реєстрацій
+        attended_total = 0
+        rating_pairs = []
+        rating_share = 0.0
+
+        def registration_rows():
+            nonlocal attended_total
+            for event_id, event_date, status, sample in _per_event_samples(rnd, event_rows, students, registrations):
+                for user_id in sample:
+                    if rnd.random() < 0.1:
+                        reg_status = 'cancelled'
+                    elif status == 'completed':
+                        reg_status = 'attended'
+                        attended_total += 1
+                        if rnd.random() < rating_share:
+                            rating_pairs.append((event_id, user_id, event_date))
+                    else:
+                        reg_status = 'registered'
+                    yield (event_id, user_id, event_date - timedelta(days=rnd.randint(2, 60)), reg_status)
+
+        completed = sum(1 for row in event_rows if row[2] == 'completed')
+        expected_attended = registrations * 0.9 * completed / max(len(event_rows), 1)
+        rating_share = min(1.0, ratings / expected_attended) if expected_attended else 0.0
+        _timed('registrations', bulk, 'registrations', REGISTRATION_COLUMNS, registration_rows())
+
+        def rating_rows():
+            for event_id, user_id, event_date in rating_pairs[:ratings]:
+                score = rnd.choices([1, 2, 3, 4, 5], weights=[1, 2, 5, 10, 12])[0]
+                yield (event_id, user_id, score, None, event_date + timedelta(days=rnd.randint(0, 7)))
+
+        if ratings:
+            _timed('ratings', bulk, 'ratings', RATING_COLUMNS, rating_rows())
+
+        def comment_rows():
+            all_users = organizers + students
+            for _ in range(comments):
+                event_id, event_date, _ = rnd.choice(event_rows)
+                created = min(now, event_date + timedelta(days=rnd.randint(-30, 5), minutes=rnd.randint(0, 1440)))
+                yield (event_id, rnd.choice(all_users), rnd.choice(COMMENTS), created)
+
+        if comments and event_rows:
+            _timed('comments', bulk, 'comments', COMMENT_COLUMNS, comment_rows())
+    finally:
+        connection.close()
+
+    recount(db)
+    return load_ids(db)
+
+
+def recount(db, batch_size=10000):
+    """Узгодження лічильників подій з фактичними даними (учасники, реєстрації, оцінки, коментарі)"""
+    from models import Comment, Rating, Registration
+
+    started = time.perf_counter()
+    result = db.execute_query("SELECT COALESCE(MAX(id), 0) as max_id FROM events", fetch=True)
+    max_id = result[0]['max_id'] if result else 0
+    for start in range(1, max_id + 1, batch_size):
+        end = start + batch_size - 1
+        db.execute_query("""
+            UPDATE events e
+            LEFT JOIN (
+                SELECT event_id, COUNT(*) as cnt FROM registrations
+                WHERE event_id BETWEEN %s AND %s AND status != 'cancelled'
+                GROUP BY event_id
+            ) r ON r.event_id = e.id
+            SET e.current_participants = COALESCE(r.cnt, 0),
+                e.max_participants = GREATEST(e.max_participants, COALESCE(r.cnt, 0))
+            WHERE e.id BETWEEN %s AND %s
+        """, (start, end, start, end))
+    Registration(db).rebuild_stats(batch_size)
+    Rating(db).rebuild_aggregates(batch_size)
+    Comment(db).rebuild_counts(batch_size)
+    db.release()
+    print(f"  {'лічильники':<14}перераховано за {time.perf_counter() - started:.1f} с")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Генератор синтетичних даних UniMeet')
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--registrations', type=int, default=100000)
+    parser.add_argument('--comments', type=int, default=20000)
+    parser.add_argument('--ratings', type=int, default=20000)
+    parser.add_argument('--organizer-share', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--loader', choices=['executemany', 'infile'], default='executemany')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--clear', action='store_true', help='спершу видалити попередній набір')
+    args = parser.parse_args()
+
+    from models import Database
+
+    db = Database(pool_size=1)
+    if args.clear:
+        print(f"Видалено користувачів попереднього набору: {clear(db)}")
+    started = time.perf_counter()
+    ids = seed(db, users=args.users, events=args.events, registrations=args.registrations,
+               comments=args.comments, ratings=args.ratings, organizer_share=args.organizer_share,
+               seed=args.seed, loader=args.loader, batch_size=args.batch_size)
+    print(f"Готово за {time.perf_counter() - started:.1f} с: "
+          + ', '.join(f"{key}={len(value)}" for key, value in ids.items()))
+    db.disconnect()
+
+
+if __name__ == '__main__':
+    main()
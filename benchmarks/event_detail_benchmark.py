@@ -0,0 +1,65 @@
+"""Порівняння затримки завантаження даних сторінки події: 4 послідовні запити проти одного звернення.
+
+Запуск (потрібна локальна MySQL з даними):
+    python -m benchmarks.event_detail_benchmark --event-id 1 --user-id 1 --iterations 2000
+"""
+import argparse
+import statistics
+import time
+
+from models import Database, Event, Comment, Rating, Registration
+
+
+def sequential(db, event_id, user_id):
+    """Старий шлях маршруту event_detail"""
+    event = Event(db).get_by_id(event_id)
+    comments = Comment(db).get_by_event(event_id)
+    rating_data = Rating(db).get_average(event_id)
+    registration = Registration(db).check_registration(event_id, user_id) if user_id else None
+    return event, comments, rating_data, registration
+
+
+def batched(db, event_id, user_id):
+    """Новий шлях: Event.load_detail"""
+    return Event(db).load_detail(event_id, user_id)
+
+
+def measure(loader, db, event_id, user_id, iterations):
+    """Затримки в мілісекундах"""
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        loader(db, event_id, user_id)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(name, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{name:<12} середнє {statistics.mean(timings):.3f} мс, "
+          f"p50 {statistics.median(timings):.3f} мс, p95 {p95:.3f} мс")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк завантаження сторінки події')
+    parser.add_argument('--event-id', type=int, default=1)
+    parser.add_argument('--user-id', type=int, default=None)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    db = Database(pool_size=1)
+    if not Event(db).get_by_id(args.event_id):
+        raise SystemExit(f"Подію {args.event_id} не знайдено")
+
+    # Прогрів з'єднання та кешу запитів
+    measure(sequential, db, args.event_id, args.user_id, 50)
+    measure(batched, db, args.event_id, args.user_id, 50)
+
+    report('sequential', measure(sequential, db, args.event_id, args.user_id, args.iterations))
+    report('batched', measure(batched, db, args.event_id, args.user_id, args.iterations))
+    db.disconnect()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+"""Відтворюваний HTTP-бенчмарк основних маршрутів.
+
+Запускає Flask-застосунок у цьому ж процесі (багатопотоковий werkzeug-сервер),
+за потреби заповнює базу синтетичними даними і навантажує гарячі маршрути
+заданою кількістю паралельних клієнтів. Для кожного маршруту звітує пропускну
+здатність, p50/p95/p99 затримки та кількість SQL-запитів на HTTP-запит,
+результат зберігається у JSON для порівняння між комітами.
+
+Використовуйте окрему базу даних (MYSQL_DB) — бенчмарк створює записи.
+
+Запуск:
+    python -m benchmarks.http_benchmark --seed --users 2000 --events 500 --concurrency 32
+    python -m benchmarks.http_benchmark --requests 2000 --compare benchmarks/results/old.json
+"""
+import argparse
+import http.cookiejar
+import json
+import logging
+import os
+import random
+import statistics
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+
+from werkzeug.serving import make_server
+
+from benchmarks import dataset
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Відповідь 302 вимірюється як є, без переходу за перенаправленням"""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class Client:
+    """Віртуальний користувач зі своєю сесією (cookie)"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect()
+        )
+
+    def request(self, method, path, data=None):
+        """Статус, кількість SQL-запитів і затримка в секундах"""
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + path, data=body, method=method)
+        started = time.perf_counter()
+        try:
+            with self.opener.open(req) as response:
+                response.read()
+                status, headers = response.status, response.headers
+        except urllib.error.HTTPError as err:
+            err.read()
+            status, headers = err.code, err.headers
+        elapsed = time.perf_counter() - started
+        return status, int(headers.get('X-DB-Query-Count') or 0), elapsed
+
+    def login(self, email):
+        status, _, _ = self.request('POST', '/login', {'email': email, 'password': dataset.PASSWORD})
+        return status == 302
+
+
+def scenarios(ids):
+    """Маршрути: назва -> (роль клієнта, функція, що повертає (метод, шлях, дані))"""
+    events = ids['events']
+    return {
+        'index': (None, lambda rnd: ('GET', '/', None)),
+        'events': (None, lambda rnd: ('GET', '/events', None)),
+        'event_detail': ('student', lambda rnd: ('GET', f'/event/{rnd.choice(events)}', None)),
+        'register_for_event': ('student', lambda rnd: ('POST', f'/event/{rnd.choice(events)}/register', {})),
+        'profile': ('student', lambda rnd: ('GET', '/profile', None)),
+        'my_events': ('organizer', lambda rnd: ('GET', '/my-events', None)),
+    }
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_scenario(base_url, role, make_request, accounts, requests, concurrency, seed):
+    """Паралельне виконання requests запитів одного маршруту"""
+    latencies, queries, errors = [], [], []
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def worker(number):
+        rnd = random.Random(seed * 1000 + number)
+        client = Client(base_url)
+        if role and not client.login(accounts[role][number % len(accounts[role])]):
+            with lock:
+                errors.append('login')
+            return
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    return
+            method, path, data = make_request(rnd)
+            status, query_count, elapsed = client.request(method, path, data)
+            with lock:
+                latencies.append(elapsed)
+                queries.append(query_count)
+                if status >= 500:
+                    errors.append(status)
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    if not latencies:
+        return {'requests': 0, 'errors': len(errors)}
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'throughput_rps': len(latencies) / wall,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'mean_ms': statistics.mean(latencies) * 1000,
+        'queries_per_request': statistics.mean(queries),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def print_report(results, baseline=None):
+    print(f"{'маршрут':<20}{'rps':>9}{'p50 мс':>9}{'p95 мс':>9}{'p99 мс':>9}{'SQL/запит':>11}{'помилки':>9}")
+    for name, row in results.items():
+        if not row.get('requests'):
+            print(f"{name:<20}{'—':>9}")
+            continue
+        line = (f"{name:<20}{row['throughput_rps']:>9.1f}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+                f"{row['p99_ms']:>9.1f}{row['queries_per_request']:>11.1f}{row['errors']:>9}")
+        old = (baseline or {}).get(name)
+        if old and old.get('requests'):
+            delta = (row['p95_ms'] - old['p95_ms']) / old['p95_ms'] * 100 if old['p95_ms'] else 0
+            line += f"   p95 {delta:+.0f}% до базового"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTTP-бенчмарк основних маршрутів UniMeet')
+    parser.add_argument('--seed', action='store_true', help='перестворити синтетичний набір даних')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--events', type=int, default=200)
+    parser.add_argument('--registrations', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=1000, help='запитів на маршрут')
+    parser.add_argument('--routes', default='', help='маршрути через кому (за замовчуванням усі)')
+    parser.add_argument('--random-seed', type=int, default=1)
+    parser.add_argument('--output', help='файл JSON з результатами (за замовчуванням у benchmarks/results)')
+    parser.add_argument('--compare', help='JSON попереднього запуску для порівняння')
+    args = parser.parse_args()
+
+    from app import app, db
+
+    app.config['QUERY_STATS_HEADERS'] = True
+    app.logger.setLevel(logging.WARNING)
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    db.pool_size = max(db.pool_size, args.concurrency)
+
+    if args.seed:
+        dataset.clear(db)
+        started = time.perf_counter()
+        dataset.seed(db, users=args.users, events=args.events,
+                     registrations=args.registrations, seed=args.random_seed)
+        print(f"Набір даних згенеровано за {time.perf_counter() - started:.1f} с")
+    ids = dataset.load_ids(db)
+    db.release()
+    if not ids['events'] or not ids['students'] or not ids['organizers']:
+        raise SystemExit('Синтетичних даних немає: запустіть з --seed')
+
+    accounts = {
+        'student': [dataset.bench_email(i) for i in range(len(ids['organizers']), len(ids['users']))],
+        'organizer': [dataset.bench_email(i) for i in range(len(ids['organizers']))],
+    }
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}'
+
+    selected = [name.strip() for name in args.routes.split(',') if name.strip()]
+    results = {}
+    try:
+        for name, (role, make_request) in scenarios(ids).items():
+            if selected and name not in selected:
+                continue
+            results[name] = run_scenario(base_url, role, make_request, accounts,
+                                         args.requests, args.concurrency, args.random_seed)
+    finally:
+        server.shutdown()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['routes']
+    print_report(results, baseline)
+
+    revision = git_revision()
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{revision}.json"
+    )
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'revision': revision,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'settings': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+            'dataset': {key: len(value) for key, value in ids.items()},
+            'routes': results,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"Результати збережено: {output}")
+
+
+if __name__ == '__main__':
+    main()
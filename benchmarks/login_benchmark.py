@@ -0,0 +1,108 @@
+"""Масовий вхід: пропускна здатність /login і вплив на затримку /events.
+
+Спершу вимірює /events без навантаження, потім те саме під час «шторму» входів.
+Порівняйте хешування в потоці запиту (--workers 0) і в пулі процесів (--workers N).
+Потрібні користувачі синтетичного набору (python -m benchmarks.http_benchmark --seed).
+
+Запуск:
+    python -m benchmarks.login_benchmark --workers 0 --login-clients 32 --duration 20
+    python -m benchmarks.login_benchmark --workers 4 --login-clients 32 --duration 20
+"""
+import argparse
+import logging
+import os
+import statistics
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+from benchmarks import dataset
+from benchmarks.http_benchmark import Client, percentile
+
+
+def run_clients(count, action, duration):
+    """count потоків виконують action(number) протягом duration секунд; список (успіх, затримка)"""
+    results = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(number):
+        while time.perf_counter() < deadline:
+            ok, elapsed = action(number)
+            with lock:
+                results.append((ok, elapsed))
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def report(name, results, duration):
+    latencies = [elapsed for ok, elapsed in results if ok]
+    failed = len(results) - len(latencies)
+    if not latencies:
+        print(f"{name:<22} немає успішних запитів (помилок: {failed})")
+        return
+    print(f"{name:<22}{len(latencies) / duration:>9.1f}/с  p50 {percentile(latencies, 0.5) * 1000:7.1f} мс  "
+          f"p95 {percentile(latencies, 0.95) * 1000:7.1f} мс  середнє {statistics.mean(latencies) * 1000:7.1f} мс  "
+          f"помилок {failed}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк масового входу')
+    parser.add_argument('--workers', type=int, default=2, help='процеси хешування (0 — у потоці запиту)')
+    parser.add_argument('--login-clients', type=int, default=32)
+    parser.add_argument('--page-clients', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=20)
+    args = parser.parse_args()
+
+    # Конфігурація читається під час імпорту застосунку
+    os.environ['PASSWORD_HASH_WORKERS'] = str(args.workers)
+    from app import app, db
+
+    app.logger.setLevel(logging.WARNING)
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    db.pool_size = max(db.pool_size, args.login_clients + args.page_clients)
+
+    ids = dataset.load_ids(db)
+    db.release()
+    if not ids['students']:
+        raise SystemExit('Синтетичних даних немає: python -m benchmarks.http_benchmark --seed')
+    emails = [dataset.bench_email(i) for i in range(len(ids['organizers']), len(ids['users']))]
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}'
+
+    def browse(number):
+        status, _, elapsed = Client(base_url).request('GET', '/events')
+        return status == 200, elapsed
+
+    def login(number):
+        email = emails[(number * 7919 + int(time.perf_counter() * 1000)) % len(emails)]
+        status, _, elapsed = Client(base_url).request('POST', '/login',
+                                                       {'email': email, 'password': dataset.PASSWORD})
+        return status == 302, elapsed
+
+    try:
+        print(f"Процесів хешування: {args.workers}, клієнтів входу: {args.login_clients}")
+        report('/events без входів', run_clients(args.page_clients, browse, args.duration), args.duration)
+
+        storm = {}
+        thread = threading.Thread(target=lambda: storm.update(
+            results=run_clients(args.login_clients, login, args.duration)))
+        thread.start()
+        browsing = run_clients(args.page_clients, browse, args.duration)
+        thread.join()
+        report('/events під час входів', browsing, args.duration)
+        report('/login', storm['results'], args.duration)
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
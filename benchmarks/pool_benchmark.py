@@ -0,0 +1,52 @@
+"""Навантажувальний тест пулу з'єднань.
+
+Запуск (потрібна локальна MySQL з розгорнутою схемою):
+    python -m benchmarks.pool_benchmark --threads 50 --requests 200 --pool-size 10
+"""
+import argparse
+import threading
+import time
+
+from models import Database
+
+
+def worker(db, requests, errors):
+    """Імітація HTTP-запитів: кілька SQL-запитів і повернення з'єднання"""
+    for _ in range(requests):
+        try:
+            for _ in range(3):
+                if db.execute_query("SELECT 1 AS ok", fetch=True) is None:
+                    errors.append(1)
+        finally:
+            db.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Навантажувальний тест пулу з'єднань")
+    parser.add_argument('--threads', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=200, help='запитів на потік')
+    parser.add_argument('--pool-size', type=int, default=10)
+    args = parser.parse_args()
+
+    db = Database(pool_size=args.pool_size)
+    errors = []
+    threads = [threading.Thread(target=worker, args=(db, args.requests, errors))
+               for _ in range(args.threads)]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = args.threads * args.requests
+    print(f"Запитів: {total}, помилок: {len(errors)}, час: {elapsed:.2f} с")
+    print(f"Пропускна здатність: {total / elapsed:.0f} запитів/с")
+    for key, value in db.pool_stats().items():
+        print(f"  {key}: {value:.4f}" if isinstance(value, float) else f"  {key}: {value}")
+    db.disconnect()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Накладні витрати на запит: текстовий протокол проти закешованих prepared statements.
+
+Виконує типові шаблони моделей (подія за id, принципал користувача, список подій) на одному з'єднанні.
+Запуск (потрібна локальна MySQL з даними):
+    python -m benchmarks.prepared_benchmark --event-id 1 --user-id 1 --iterations 5000
+"""
+import argparse
+import statistics
+import time
+
+from models import Database, Event, User, cache
+
+
+def workload(db, event_id, user_id):
+    """Шаблони гарячих маршрутів без кешу довідкових даних"""
+    Event(db).get_by_id(event_id)
+    User(db).get_by_id(user_id)
+    Event(db).get_all(status='upcoming', limit=10)
+
+
+def measure(db, event_id, user_id, iterations):
+    """Затримки одного запиту в мікросекундах"""
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        workload(db, event_id, user_id)
+        timings.append((time.perf_counter() - started) * 1e6 / 3)
+    return timings
+
+
+def report(name, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{name:<10} середнє {statistics.mean(timings):.1f} мкс/запит, "
+          f"p50 {statistics.median(timings):.1f} мкс, p95 {p95:.1f} мкс")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк prepared statements')
+    parser.add_argument('--event-id', type=int, default=1)
+    parser.add_argument('--user-id', type=int, default=1)
+    parser.add_argument('--iterations', type=int, default=5000)
+    args = parser.parse_args()
+
+    cache.clear()
+    for name, prepared in (('text', False), ('prepared', True)):
+        db = Database(pool_size=1, prepared=prepared)
+        if not Event(db).get_by_id(args.event_id):
+            raise SystemExit(f"Подію {args.event_id} не знайдено")
+        measure(db, args.event_id, args.user_id, 100)
+        report(name, measure(db, args.event_id, args.user_id, args.iterations))
+        stats = db.statement_stats()
+        if stats:
+            print(f"{'':<10} кеш statements: {stats['hits']} влучань, {stats['misses']} промахів "
+                  f"({stats['hit_ratio']:.1%})")
+        db.release()
+        db.disconnect()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Конкурентний тест бронювання місць (перевірка відсутності овербукінгу).
+
+Створює тимчасову подію з обмеженою кількістю місць і тимчасових студентів,
+після чого всі клієнти одночасно реєструються. Після тесту дані видаляються.
+
+Запуск (потрібна локальна MySQL з розгорнутою схемою):
+    python -m benchmarks.reservation_benchmark --clients 200 --capacity 50
+    python -m benchmarks.reservation_benchmark --legacy   # старий шлях "прочитав-перевірив-записав"
+"""
+import argparse
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+from models import Database, Event, Registration
+
+
+def create_fixture(db, clients, capacity):
+    """Тимчасові організатор, студенти та подія"""
+    tag = uuid.uuid4().hex[:8]
+    rows = [(f'bench_{tag}_{i}', f'bench_{tag}_{i}@example.com', '-', f'Bench {i}')
+            for i in range(clients + 1)]
+    with db.transaction() as cursor:
+        cursor.executemany(
+            "INSERT INTO users (username, email, password_hash, full_name) VALUES (%s, %s, %s, %s)",
+            rows
+        )
+        cursor.execute("SELECT id FROM users WHERE username LIKE %s ORDER BY id", (f'bench_{tag}_%',))
+        user_ids = [row['id'] for row in cursor.fetchall()]
+        organizer_id = user_ids.pop(0)
+        event_date = datetime.now() + timedelta(days=30)
+        cursor.execute("""
+            INSERT INTO events (title, description, organizer_id, location, event_date,
+                                registration_deadline, max_participants)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """, (f'Benchmark {tag}', 'benchmark', organizer_id, 'Онлайн',
+              event_date, event_date, capacity))
+        event_id = cursor.lastrowid
+    return event_id, organizer_id, user_ids
+
+
+def drop_fixture(db, event_id, organizer_id, user_ids):
+    """Видалення тимчасових даних (реєстрації видаляються каскадно)"""
+    with db.transaction() as cursor:
+        cursor.execute("DELETE FROM events WHERE id = %s", (event_id,))
+        ids = [organizer_id] + user_ids
+        cursor.execute(f"DELETE FROM users WHERE id IN ({', '.join(['%s'] * len(ids))})", tuple(ids))
+    db.release()
+
+
+def legacy_register(db, event_id, user_id):
+    """Старий шлях з маршруту: окремі автокомітні запити без блокувань"""
+    event = Event(db).get_by_id(event_id)
+    registration = Registration(db)
+    existing = registration.check_registration(event_id, user_id)
+    if existing and existing['status'] != 'cancelled':
+        return 'already'
+    if event['current_participants'] >= event['max_participants']:
+        return 'full'
+    if registration.create(event_id, user_id) is None:
+        return None
+    Event(db).increment_participants(event_id)
+    return 'reserved'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Конкурентний тест бронювання місць')
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--capacity', type=int, default=50)
+    parser.add_argument('--pool-size', type=int, default=32)
+    parser.add_argument('--legacy', action='store_true', help='старий неатомарний шлях')
+    args = parser.parse_args()
+
+    db = Database(pool_size=args.pool_size)
+    event_id, organizer_id, user_ids = create_fixture(db, args.clients, args.capacity)
+    db.release()
+
+    results = Counter()
+    lock = threading.Lock()
+    barrier = threading.Barrier(args.clients)
+
+    def client(user_id):
+        barrier.wait()
+        try:
+            if args.legacy:
+                result = legacy_register(db, event_id, user_id)
+            else:
+                result = Registration(db).reserve(event_id, user_id)
+        finally:
+            db.release()
+        with lock:
+            results[result] += 1
+
+    threads = [threading.Thread(target=client, args=(user_id,)) for user_id in user_ids]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    try:
+        counter = db.execute_query(
+            "SELECT current_participants FROM events WHERE id = %s", (event_id,), fetch=True
+        )[0]['current_participants']
+        active = db.execute_query(
+            "SELECT COUNT(*) AS total FROM registrations WHERE event_id = %s AND status != 'cancelled'",
+            (event_id,), fetch=True
+        )[0]['total']
+        db.release()
+    finally:
+        drop_fixture(db, event_id, organizer_id, user_ids)
+
+    print(f"Режим: {'legacy' if args.legacy else 'reserve'}, клієнтів: {args.clients}, місць: {args.capacity}")
+    print(f"Результати: {dict(results)}")
+    print(f"Лічильник події: {counter}, активних реєстрацій: {active}")
+    print(f"Час: {elapsed:.3f} с, {args.clients / elapsed:.0f} реєстрацій/с")
+    oversold = max(counter, active) > args.capacity or counter != active
+    print('ОВЕРБУКІНГ АБО РОЗБІЖНІСТЬ!' if oversold else 'Овербукінгу немає')
+    db.disconnect()
+    raise SystemExit(1 if oversold else 0)
+
+
+if __name__ == '__main__':
+    main()
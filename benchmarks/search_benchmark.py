@@ -0,0 +1,100 @@
+"""Бенчмарк пошуку подій на синтетичному наборі даних.
+
+memory   — будує in-process індекс з N згенерованих подій (БД не потрібна);
+fulltext — виконує Event.search через MySQL FULLTEXT (потрібна БД з даними).
+
+Запуск:
+    python -m benchmarks.search_benchmark --backend memory --events 100000
+    python -m benchmarks.search_benchmark --backend fulltext --queries 500
+"""
+import argparse
+import random
+import statistics
+import time
+
+from config import Config
+
+WORDS = ('хакатон конференція семінар воркшоп лекція турнір фестиваль зустріч '
+         'python java машинне навчання дизайн бізнес стартап кібербезпека '
+         'математика фізика історія музика футбол шахи волонтерство кар\'єра '
+         'data science web mobile cloud robotics економіка право медицина').split()
+CATEGORIES = ['Конференція', 'Семінар', 'Хакатон', 'Культурна подія', 'Спортивна подія', 'Networking']
+STATUSES = ['upcoming', 'ongoing', 'completed']
+NAMES = ['Олена Коваленко', 'Андрій Шевченко', 'Марія Бондаренко', 'Іван Ткаченко', 'Софія Мельник']
+
+
+def synthetic_events(count, seed=42):
+    """Згенеровані рядки подій у форматі Event.get_all"""
+    rnd = random.Random(seed)
+    for event_id in range(1, count + 1):
+        category_id = rnd.randrange(len(CATEGORIES))
+        yield {
+            'id': event_id,
+            'title': ' '.join(rnd.choices(WORDS, k=4)).capitalize(),
+            'description': ' '.join(rnd.choices(WORDS, k=40)),
+            'category_id': category_id + 1,
+            'category_name': CATEGORIES[category_id],
+            'organizer_name': rnd.choice(NAMES),
+            'status': rnd.choice(STATUSES),
+        }
+
+
+def sample_queries(count, seed=7):
+    rnd = random.Random(seed)
+    return [' '.join(rnd.choices(WORDS, k=rnd.randint(1, 3))) for _ in range(count)]
+
+
+def report(timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"Запитів: {len(timings)}, середнє {statistics.mean(timings):.3f} мс, "
+          f"p50 {statistics.median(timings):.3f} мс, p95 {p95:.3f} мс")
+
+
+def bench_memory(args):
+    from models import SearchIndex
+
+    index = SearchIndex()
+    started = time.perf_counter()
+    index.build(synthetic_events(args.events))
+    print(f"Індекс на {args.events} подій побудовано за {time.perf_counter() - started:.2f} с")
+
+    timings = []
+    for query in sample_queries(args.queries):
+        started = time.perf_counter()
+        index.search(query, status=random.choice([None, 'upcoming']), limit=args.per_page + 1)
+        timings.append((time.perf_counter() - started) * 1000)
+    report(timings)
+
+
+def bench_fulltext(args):
+    from models import Database, Event
+
+    Config.SEARCH_BACKEND = 'fulltext'
+    db = Database(pool_size=1)
+    event = Event(db)
+    timings = []
+    for query in sample_queries(args.queries):
+        started = time.perf_counter()
+        event.search(query, status=random.choice([None, 'upcoming']), per_page=args.per_page)
+        timings.append((time.perf_counter() - started) * 1000)
+    report(timings)
+    db.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк пошуку подій')
+    parser.add_argument('--backend', choices=['memory', 'fulltext'], default='memory')
+    parser.add_argument('--events', type=int, default=100000, help='розмір синтетичного набору (memory)')
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--per-page', type=int, default=Config.ITEMS_PER_PAGE)
+    args = parser.parse_args()
+
+    if args.backend == 'memory':
+        bench_memory(args)
+    else:
+        bench_fulltext(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -13,5 +13,68 @@ class Config:
     MYSQL_DB = os.environ.get('MYSQL_DB') or 'student_events_db'
     MYSQL_PORT = int(os.environ.get('MYSQL_PORT') or 3306)
     
+    # Пул з'єднань (0 — одне спільне з'єднання без пулу)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 5)
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT') or 10)
+    DB_POOL_PING_INTERVAL = float(os.environ.get('DB_POOL_PING_INTERVAL') or 30)
+    # Репліки для читання: "host:port,host:port" (той самий користувач і база, що й основний сервер)
+    MYSQL_REPLICAS = [host.strip() for host in (os.environ.get('MYSQL_REPLICAS') or '').split(',') if host.strip()]
+    # Скільки секунд після запису читання користувача йдуть на основний сервер (read-your-writes)
+    DB_REPLICA_PIN_SECONDS = float(os.environ.get('DB_REPLICA_PIN_SECONDS') or 5)
+    
+    # Серверні prepared statements, закешовані для кожного з'єднання за текстом запиту
+    DB_PREPARED_STATEMENTS = (os.environ.get('DB_PREPARED_STATEMENTS') or 'false').lower() in ('1', 'true', 'yes')
+    DB_PREPARED_CACHE_SIZE = int(os.environ.get('DB_PREPARED_CACHE_SIZE') or 64)
+    # Пул aiomysql для async-представлень (незалежні запити сторінки виконуються одночасно)
+    ASYNC_DB_POOL_SIZE = int(os.environ.get('ASYNC_DB_POOL_SIZE') or 10)
+    
+    # Кеш довідкових даних: 'memory' (LRU у процесі) або 'sqlite' (спільний файл для кількох воркерів)
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND') or 'memory'
+    CACHE_PATH = os.environ.get('CACHE_PATH') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache.sqlite3')
+    CACHE_TTL = int(os.environ.get('CACHE_TTL') or 300)
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES') or 1024)
+    # Час життя кешованих даних авторизованого користувача (роль тощо)
+    PRINCIPAL_CACHE_TTL = int(os.environ.get('PRINCIPAL_CACHE_TTL') or 30)
+    # Час життя підсумків панелі організатора
+    DASHBOARD_TOTALS_TTL = int(os.environ.get('DASHBOARD_TOTALS_TTL') or 30)
+    # Кеш готових сторінок / і /events для анонімних відвідувачів (у пам'яті процесу)
+    PAGE_CACHE_ENABLED = (os.environ.get('PAGE_CACHE_ENABLED') or 'true').lower() in ('1', 'true', 'yes')
+    PAGE_CACHE_TTL = int(os.environ.get('PAGE_CACHE_TTL') or 30)
+    PAGE_CACHE_MAX_ENTRIES = int(os.environ.get('PAGE_CACHE_MAX_ENTRIES') or 256)
+    
+    # Пошук подій: 'fulltext' (індекси MySQL FULLTEXT) або 'memory' (in-process індекс для локального тестування)
+    SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND') or 'fulltext'
+    SEARCH_INDEX_TTL = int(os.environ.get('SEARCH_INDEX_TTL') or 300)
+    
+    # Хешування паролів: метод Werkzeug ('scrypt', 'scrypt:16384:8:1', 'pbkdf2:sha256:600000' ...),
+    # кількість процесів (0 — у потоці запиту), максимум запитів у черзі та час очікування (с).
+    # Після зміни методу хеш користувача оновлюється при наступному вході.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'scrypt'
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS') or 2)
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING') or 32)
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT') or 10)
+    
+    # Планувальник статусів подій: закриття реєстрації після дедлайну, upcoming → ongoing → completed.
+    # Подія вважається завершеною через EVENT_DURATION_HOURS після початку.
+    EVENT_SCHEDULER_ENABLED = (os.environ.get('EVENT_SCHEDULER_ENABLED') or 'true').lower() in ('1', 'true', 'yes')
+    EVENT_SCHEDULER_INTERVAL = float(os.environ.get('EVENT_SCHEDULER_INTERVAL') or 60)
+    EVENT_DURATION_HOURS = float(os.environ.get('EVENT_DURATION_HOURS') or 3)
+    EVENT_STATUS_BATCH_SIZE = int(os.environ.get('EVENT_STATUS_BATCH_SIZE') or 500)
+    
+    # Максимум адрес в одному пакетному імпорті учасників
+    IMPORT_MAX_ROWS = int(os.environ.get('IMPORT_MAX_ROWS') or 5000)
+    
+    # Інструментування: поріг журналу повільних запитів (мс) і ендпоінт /metrics
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS') or 200)
+    METRICS_ENABLED = (os.environ.get('METRICS_ENABLED') or 'false').lower() in ('1', 'true', 'yes')
+    # Якщо задано, /metrics вимагає заголовок Authorization: Bearer <токен>
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN') or ''
+    # Рівень журналу застосунку (рядок на кожен HTTP-запит пишеться на рівні INFO)
+    LOG_LEVEL = (os.environ.get('LOG_LEVEL') or 'INFO').upper()
+    # Заголовки X-DB-Query-Count / X-DB-Time-ms і поза режимом debug (для бенчмарків)
+    QUERY_STATS_HEADERS = (os.environ.get('QUERY_STATS_HEADERS') or 'false').lower() in ('1', 'true', 'yes')
+    
     DEBUG = os.environ.get('DEBUG') or True
     ITEMS_PER_PAGE = 10
+    COMMENTS_PER_PAGE = 20
+    USERS_PER_PAGE = 50
@@ -0,0 +1,16 @@
+-- Keyset-пагінація списків подій, коментарів і довідника користувачів
+
+ALTER TABLE events
+    ADD INDEX idx_status_date (status, event_date),
+    ADD INDEX idx_status_category_date (status, category_id, event_date);
+
+-- idx_event (event_id) покривається новим індексом, тому зовнішній ключ лишається проіндексованим
+ALTER TABLE comments
+    ADD INDEX idx_event_created (event_id, created_at),
+    DROP INDEX idx_event;
+
+ALTER TABLE users
+    ADD INDEX idx_created (created_at),
+    ADD INDEX idx_role_created (role, created_at),
+    ADD INDEX idx_full_name (full_name),
+    ADD INDEX idx_university (university);
@@ -0,0 +1,17 @@
+-- Збережені агрегати оцінок і лічильник коментарів подій
+
+ALTER TABLE events
+    ADD COLUMN rating_sum INT NOT NULL DEFAULT 0 AFTER current_participants,
+    ADD COLUMN rating_count INT NOT NULL DEFAULT 0 AFTER rating_sum,
+    ADD COLUMN comment_count INT NOT NULL DEFAULT 0 AFTER rating_count;
+
+UPDATE events e
+JOIN (
+    SELECT event_id, COALESCE(SUM(rating), 0) as rating_sum, COUNT(*) as rating_count
+    FROM ratings GROUP BY event_id
+) r ON r.event_id = e.id
+SET e.rating_sum = r.rating_sum, e.rating_count = r.rating_count;
+
+UPDATE events e
+JOIN (SELECT event_id, COUNT(*) as comment_count FROM comments GROUP BY event_id) c ON c.event_id = e.id
+SET e.comment_count = c.comment_count;
@@ -0,0 +1,7 @@
+-- Повнотекстовий пошук подій за назвою, описом, категорією та організатором
+
+ALTER TABLE events ADD FULLTEXT INDEX ft_event_text (title, description);
+
+ALTER TABLE event_categories ADD FULLTEXT INDEX ft_name (name);
+
+ALTER TABLE users ADD FULLTEXT INDEX ft_full_name (full_name);
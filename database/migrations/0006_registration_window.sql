@@ -0,0 +1,7 @@
+-- Закриття реєстрації після дедлайну (Event.advance_statuses)
+
+ALTER TABLE events
+    ADD COLUMN registration_open TINYINT(1) NOT NULL DEFAULT 1 AFTER status,
+    ADD INDEX idx_registration_open (registration_open, registration_deadline);
+
+UPDATE events SET registration_open = 0 WHERE registration_deadline <= NOW();
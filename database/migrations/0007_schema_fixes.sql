@@ -0,0 +1,7 @@
+-- Узгодження схеми з кодом: User.create не задає username, форма події має онлайн-формат
+
+ALTER TABLE users MODIFY username VARCHAR(50) NULL;
+
+ALTER TABLE events
+    ADD COLUMN is_online TINYINT(1) NOT NULL DEFAULT 0 AFTER location,
+    ADD COLUMN online_link VARCHAR(255) NULL AFTER is_online;
@@ -0,0 +1,12 @@
+-- Індекси, з якими сторінки організатора й учасника читаються без filesort (flask check-query-plans)
+
+ALTER TABLE events
+    ADD INDEX idx_organizer_date (organizer_id, event_date),
+    DROP INDEX idx_organizer;
+
+-- idx_event покривався унікальним ключем (event_id, user_id)
+ALTER TABLE registrations
+    ADD INDEX idx_user_date (user_id, registration_date),
+    ADD INDEX idx_event_date (event_id, registration_date),
+    DROP INDEX idx_user,
+    DROP INDEX idx_event;
@@ -0,0 +1,21 @@
+-- Лічильники реєстрацій за статусами для панелі організатора
+
+CREATE TABLE IF NOT EXISTS event_registration_stats (
+    event_id INT PRIMARY KEY,
+    registered_count INT NOT NULL DEFAULT 0,
+    attended_count INT NOT NULL DEFAULT 0,
+    cancelled_count INT NOT NULL DEFAULT 0,
+    last_registration_at TIMESTAMP NULL,
+    FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+INSERT INTO event_registration_stats (event_id, registered_count, attended_count, cancelled_count, last_registration_at)
+SELECT event_id,
+       SUM(status = 'registered'), SUM(status = 'attended'), SUM(status = 'cancelled'),
+       MAX(registration_date)
+FROM registrations
+GROUP BY event_id;
+
+-- Останні реєстрації на панелі без сортування всієї таблиці
+ALTER TABLE registrations
+    ADD INDEX idx_registration_date (registration_date);
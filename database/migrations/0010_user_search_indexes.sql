@@ -0,0 +1,6 @@
+-- Пошук у довіднику користувачів разом із фільтром ролі: (role, поле) віддає збіги вже в порядку сторінки
+
+ALTER TABLE users
+    ADD INDEX idx_role_full_name (role, full_name),
+    ADD INDEX idx_role_email (role, email),
+    ADD INDEX idx_role_university (role, university);
@@ -1,4 +1,7 @@
 -- Створення бази даних для системи організації студентських подій і конференцій
+-- Знімок поточної схеми для нових встановлень. Існуючі бази оновлюються міграціями
+-- з database/migrations (flask --app app migrate); нова міграція має змінювати і цей файл,
+-- і список застосованих версій наприкінці.
 CREATE DATABASE IF NOT EXISTS student_events_db CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
 
 USE student_events_db;
@@ -6,7 +9,7 @@ USE student_events_db;
 -- Таблиця користувачів
 CREATE TABLE IF NOT EXISTS users (
     id INT AUTO_INCREMENT PRIMARY KEY,
-    username VARCHAR(50) UNIQUE NOT NULL,
+    username VARCHAR(50) UNIQUE,
     email VARCHAR(100) UNIQUE NOT NULL,
     password_hash VARCHAR(255) NOT NULL,
     full_name VARCHAR(100) NOT NULL,
@@ -15,7 +18,16 @@ CREATE TABLE IF NOT EXISTS users (
     faculty VARCHAR(100),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_email (email),
-    INDEX idx_username (username)
+    INDEX idx_username (username),
+    -- Адмін-довідник: сторінки за (created_at, id), фільтр ролі, префіксний пошук за полем (і з роллю)
+    INDEX idx_created (created_at),
+    INDEX idx_role_created (role, created_at),
+    INDEX idx_full_name (full_name),
+    INDEX idx_university (university),
+    INDEX idx_role_full_name (role, full_name),
+    INDEX idx_role_email (role, email),
+    INDEX idx_role_university (role, university),
+    FULLTEXT INDEX ft_full_name (full_name)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Таблиця категорій подій
@@ -23,7 +35,8 @@ CREATE TABLE IF NOT EXISTS event_categories (
     id INT AUTO_INCREMENT PRIMARY KEY,
     name VARCHAR(50) UNIQUE NOT NULL,
     description TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FULLTEXT INDEX ft_name (name)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Таблиця подій
@@ -34,19 +47,37 @@ CREATE TABLE IF NOT EXISTS events (
     category_id INT,
     organizer_id INT NOT NULL,
     location VARCHAR(200) NOT NULL,
+    is_online TINYINT(1) NOT NULL DEFAULT 0,
+    online_link VARCHAR(255),
     event_date DATETIME NOT NULL,
     registration_deadline DATETIME NOT NULL,
     max_participants INT DEFAULT 100,
     current_participants INT DEFAULT 0,
+    -- Агрегати оцінок і лічильник коментарів, що оновлюються разом з ratings/comments (див. models.py)
+    rating_sum INT NOT NULL DEFAULT 0,
+    rating_count INT NOT NULL DEFAULT 0,
+    comment_count INT NOT NULL DEFAULT 0,
     status ENUM('upcoming', 'ongoing', 'completed', 'cancelled') DEFAULT 'upcoming',
+    -- Скидається планувальником після registration_deadline (Event.advance_statuses)
+    registration_open TINYINT(1) NOT NULL DEFAULT 1,
     image_url VARCHAR(255),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    -- Мікросекундна точність: updated_at використовується як валідатор HTTP-кешу (ETag)
+    updated_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
     FOREIGN KEY (category_id) REFERENCES event_categories(id) ON DELETE SET NULL,
     FOREIGN KEY (organizer_id) REFERENCES users(id) ON DELETE CASCADE,
     INDEX idx_event_date (event_date),
     INDEX idx_status (status),
-    INDEX idx_organizer (organizer_id)
+    INDEX idx_organizer_date (organizer_id, event_date),
+    -- Keyset-пагінація списку подій за (event_date, id) з фільтрами статусу та категорії
+    INDEX idx_status_date (status, event_date),
+    INDEX idx_status_category_date (status, category_id, event_date),
+    -- Пакетне закриття реєстрації планувальником
+    INDEX idx_registration_open (registration_open, registration_deadline),
+    -- MAX(updated_at) для валідатора списку подій
+    INDEX idx_updated (updated_at),
+    -- Повнотекстовий пошук подій (Event.search)
+    FULLTEXT INDEX ft_event_text (title, description)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Таблиця реєстрацій на події
@@ -60,11 +91,25 @@ CREATE TABLE IF NOT EXISTS registrations (
     FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     UNIQUE KEY unique_registration (event_id, user_id),
-    INDEX idx_event (event_id),
-    INDEX idx_user (user_id),
+    -- Списки учасників події та реєстрацій користувача за датою без filesort
+    INDEX idx_event_date (event_id, registration_date),
+    INDEX idx_user_date (user_id, registration_date),
+    -- Останні реєстрації на панелі організатора
+    INDEX idx_registration_date (registration_date),
     INDEX idx_status (status)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Лічильники реєстрацій подій за статусами (панель організатора); оновлюються в тих самих
+-- транзакціях, що й реєстрації, перераховуються командою flask rebuild-registration-stats
+CREATE TABLE IF NOT EXISTS event_registration_stats (
+    event_id INT PRIMARY KEY,
+    registered_count INT NOT NULL DEFAULT 0,
+    attended_count INT NOT NULL DEFAULT 0,
+    cancelled_count INT NOT NULL DEFAULT 0,
+    last_registration_at TIMESTAMP NULL,
+    FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- Таблиця коментарів
 CREATE TABLE IF NOT EXISTS comments (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -74,7 +119,8 @@ CREATE TABLE IF NOT EXISTS comments (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-    INDEX idx_event (event_id),
+    -- Keyset-пагінація коментарів події за (created_at, id)
+    INDEX idx_event_created (event_id, created_at),
     INDEX idx_user (user_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
@@ -93,6 +139,31 @@ CREATE TABLE IF NOT EXISTS ratings (
     INDEX idx_rating (rating)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Лічильники змін, яких не видно в events.updated_at (видалення подій, зміна імен користувачів)
+CREATE TABLE IF NOT EXISTS data_versions (
+    name VARCHAR(50) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Застосовані міграції (див. migrations.py)
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+INSERT IGNORE INTO schema_migrations (version, name) VALUES
+(1, 'initial'),
+(2, 'listing_indexes'),
+(3, 'event_counters'),
+(4, 'fulltext_search'),
+(5, 'http_validators'),
+(6, 'registration_window'),
+(7, 'schema_fixes'),
+(8, 'query_plan_indexes'),
+(9, 'registration_stats'),
+(10, 'user_search_indexes');
+
 -- Вставка початкових категорій
 INSERT INTO event_categories (name, description) VALUES
 ('Конференція', 'Наукові та академічні конференції'),
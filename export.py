@@ -0,0 +1,131 @@
+"""Потоковий експорт табличних даних у CSV та XLSX без буферизації всього файлу"""
+import csv
+import io
+import zipfile
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+# Скільки рядків накопичувати перед відправкою чергової порції клієнту
+CHUNK_ROWS = 200
+
+
+def _format(value):
+    """Значення комірки у вигляді тексту"""
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.strftime('%d.%m.%Y %H:%M')
+    return str(value)
+
+
+def _csv_cell(value):
+    """Текст комірки CSV; рядки, що починаються з = + - @, Excel виконав би як формулу"""
+    text = _format(value)
+    if isinstance(value, str) and text[:1] in ('=', '+', '-', '@', '\t', '\r'):
+        return "'" + text
+    return text
+
+
+def stream_csv(header, rows):
+    """Генератор CSV-файлу порціями (з BOM, щоб Excel коректно показав кирилицю)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(header)
+    
+    for index, row in enumerate(rows, start=1):
+        writer.writerow([_csv_cell(value) for value in row])
+        if index % CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    
+    yield buffer.getvalue().encode('utf-8')
+
+
+class _ChunkWriter:
+    """Файлоподібний об'єкт без seek, з якого zipfile пише дані, а ми їх забираємо порціями"""
+    
+    def __init__(self):
+        self._chunks = []
+    
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+
+def _xlsx_row(values):
+    """Рядок аркуша з текстовими комірками (inline strings)"""
+    cells = ''.join(
+        f'<c t="inlineStr"><is><t xml:space="preserve">{escape(_format(value))}</t></is></c>'
+        for value in values
+    )
+    return f'<row>{cells}</row>'.encode('utf-8')
+
+
+def stream_xlsx(header, rows, sheet_name='Sheet1'):
+    """Генератор XLSX-файлу: рядки аркуша стискаються й віддаються порціями"""
+    output = _ChunkWriter()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        archive.writestr('_rels/.rels', _ROOT_RELS)
+        archive.writestr('xl/workbook.xml', _WORKBOOK.format(name=escape(sheet_name[:31])))
+        archive.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+        yield output.drain()
+        
+        with archive.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            sheet.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                        b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                        b'<sheetData>')
+            sheet.write(_xlsx_row(header))
+            for index, row in enumerate(rows, start=1):
+                sheet.write(_xlsx_row(row))
+                if index % CHUNK_ROWS == 0:
+                    yield output.drain()
+            sheet.write(b'</sheetData></worksheet>')
+    
+    yield output.drain()
@@ -0,0 +1,130 @@
+"""Метрики застосунку у текстовому форматі Prometheus: затримки маршрутів і SQL-шаблонів"""
+import re
+import threading
+from functools import lru_cache
+
+# Межі кошиків гістограм у секундах (стандартні для Prometheus)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+
+@lru_cache(maxsize=1024)
+def normalize_query(query):
+    """Шаблон запиту: один рядок, списки плейсхолдерів IN (...) згорнуті"""
+    text = re.sub(r'\s+', ' ', query).strip()
+    return re.sub(r'%s(?:\s*,\s*%s)+', '%s, ...', text)
+
+
+def _escape(value):
+    """Екранування значення мітки"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+
+
+def _labels(names, values):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+class Histogram:
+    """Гістограма з мітками (кумулятивні кошики, сума та кількість)"""
+    
+    def __init__(self, name, help_text, label_names, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+    
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                base = _labels(self.label_names, labels)
+                prefix = base + ',' if base else ''
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {bucket_count}')
+                lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {count}')
+                lines.append(f'{self.name}_sum{{{base}}} {total}')
+                lines.append(f'{self.name}_count{{{base}}} {count}')
+        return lines
+
+
+class Summary:
+    """Кількість, сума та максимум спостережень з мітками"""
+    
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._series = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0, 0, 0.0]
+            series[0] += value
+            series[1] += 1
+            series[2] = max(series[2], value)
+    
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} summary']
+        maxima = [f'# HELP {self.name}_max {self.help_text} (максимум)', f'# TYPE {self.name}_max gauge']
+        with self._lock:
+            for labels, (total, count, maximum) in sorted(self._series.items()):
+                base = _labels(self.label_names, labels)
+                lines.append(f'{self.name}_sum{{{base}}} {total}')
+                lines.append(f'{self.name}_count{{{base}}} {count}')
+                maxima.append(f'{self.name}_max{{{base}}} {maximum}')
+        return lines + maxima
+
+
+class Metrics:
+    """Реєстр метрик застосунку"""
+    
+    def __init__(self):
+        self.request_latency = Histogram(
+            'unimeet_http_request_duration_seconds', 'Час обробки HTTP-запиту', ('route', 'method')
+        )
+        self.request_queries = Histogram(
+            'unimeet_http_request_db_queries', 'Кількість SQL-запитів на HTTP-запит', ('route',),
+            buckets=QUERY_COUNT_BUCKETS
+        )
+        self.query_latency = Summary(
+            'unimeet_db_query_duration_seconds', 'Час виконання SQL-запитів за шаблоном', ('query',)
+        )
+    
+    def observe_request(self, route, method, elapsed, queries):
+        self.request_latency.observe((route, method), elapsed)
+        self.request_queries.observe((route,), queries)
+    
+    def observe_query(self, query, elapsed):
+        self.query_latency.observe((normalize_query(query),), elapsed)
+    
+    def render(self, gauges=None, counters=None):
+        """Текст для /metrics; gauges і counters — додаткові значення {назва: (опис, число)}
+        
+        counters — монотонні лічильники (назви з суфіксом _total), gauges — поточні значення.
+        """
+        lines = []
+        for metric in (self.request_latency, self.request_queries, self.query_latency):
+            lines.extend(metric.render())
+        for kind, values in (('counter', counters), ('gauge', gauges)):
+            for name, (help_text, value) in (values or {}).items():
+                lines.extend([f'# HELP {name} {help_text}', f'# TYPE {name} {kind}', f'{name} {value}'])
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
@@ -0,0 +1,114 @@
+"""Версійні міграції схеми БД.
+
+Скрипти лежать у database/migrations і називаються NNNN_назва.sql; застосовуються по черзі,
+кожна застосована версія записується в schema_migrations. База, створена зі старого schema.sql
+(без schema_migrations), приймається як версія 1, а наступні скрипти пропускають зміни,
+які в ній уже є (індекс чи колонка з такою назвою).
+
+Запуск: flask --app app migrate [--dry-run]
+"""
+import os
+import re
+
+import mysql.connector
+from mysql.connector import errorcode
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database', 'migrations')
+
+# Помилки «уже є / вже немає», які означають, що зміна була зроблена вручну до появи міграцій
+ALREADY_APPLIED_ERRORS = (
+    errorcode.ER_DUP_KEYNAME,
+    errorcode.ER_DUP_FIELDNAME,
+    errorcode.ER_CANT_DROP_FIELD_OR_KEY,
+    errorcode.ER_TABLE_EXISTS_ERROR,
+)
+
+
+class MigrationError(Exception):
+    """Помилка застосування міграції"""
+
+
+def load_migrations(directory=MIGRATIONS_DIR):
+    """Список (версія, назва, шлях) у порядку версій"""
+    migrations = []
+    for filename in os.listdir(directory):
+        match = re.match(r'^(\d+)_(\w+)\.sql$', filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise MigrationError(f"Повторювані номери міграцій у {directory}")
+    return migrations
+
+
+def split_statements(script):
+    """Інструкції SQL-скрипта (розділювач — «;» у кінці рядка, коментарі «--» відкидаються)"""
+    lines = [line for line in script.splitlines() if not line.strip().startswith('--')]
+    statements = re.split(r';\s*$', '\n'.join(lines), flags=re.MULTILINE)
+    return [statement.strip() for statement in statements if statement.strip()]
+
+
+def _table_exists(cursor, table):
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s",
+        (table,)
+    )
+    return cursor.fetchone()[0] > 0
+
+
+def applied_versions(cursor):
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def migrate(db, dry_run=False, directory=MIGRATIONS_DIR):
+    """Застосування нових міграцій; список застосованих (версія, назва)"""
+    migrations = load_migrations(directory)
+    connection = db.get_connection()
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INT PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """)
+        applied = applied_versions(cursor)
+        adopting = not applied and _table_exists(cursor, 'events')
+        if adopting and migrations and not dry_run:
+            # Існуюча база без історії міграцій: початкова схема вже створена schema.sql
+            version, name, _ = migrations[0]
+            cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+            connection.commit()
+            applied.add(version)
+        elif adopting and migrations:
+            applied.add(migrations[0][0])
+
+        done = []
+        for version, name, path in migrations:
+            if version in applied:
+                continue
+            done.append((version, name))
+            if dry_run:
+                continue
+            with open(path, encoding='utf-8') as f:
+                statements = split_statements(f.read())
+            for statement in statements:
+                try:
+                    cursor.execute(statement)
+                    if cursor.with_rows:
+                        cursor.fetchall()
+                except mysql.connector.Error as err:
+                    if adopting and err.errno in ALREADY_APPLIED_ERRORS:
+                        print(f"  {version:04d}_{name}: пропущено ({err.msg})")
+                        continue
+                    connection.rollback()
+                    raise MigrationError(f"Міграція {version:04d}_{name}: {err}") from err
+            cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+            connection.commit()
+        return done
+    finally:
+        cursor.close()
+        db.release()
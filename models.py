@@ -1,25 +1,373 @@
+import contextvars
+import heapq
+import logging
+import math
+import pickle
+import re
+import sqlite3
+import threading
+import unicodedata
+from bisect import bisect_left
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 import mysql.connector
+from mysql.connector import errorcode
 from config import Config
-from werkzeug.security import generate_password_hash, check_password_hash
+from passwords import password_hasher
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+# Коди помилок, після яких з'єднання вважається втраченим
+CONNECTION_LOST_ERRORS = (
+    errorcode.CR_SERVER_GONE_ERROR,
+    errorcode.CR_SERVER_LOST,
+    errorcode.CR_SERVER_LOST_EXTENDED,
+    errorcode.CR_CONN_HOST_ERROR,
+)
+
+
+class ConnectionPool:
+    """Потокобезпечний пул з'єднань з перевіркою стану та метриками"""
+    
+    def __init__(self, connect, size=5, timeout=10, ping_interval=30):
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self._idle = []
+        self._created = 0
+        self._in_use = 0
+        self._waiters = 0
+        self._condition = threading.Condition()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._reconnects = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+    
+    def acquire(self):
+        """Отримання з'єднання з пулу (з очікуванням, якщо всі зайняті)"""
+        started = time.perf_counter()
+        deadline = started + self.timeout
+        
+        with self._condition:
+            while not self._idle and self._created >= self.size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise mysql.connector.errors.PoolError(
+                        f"Немає вільних з'єднань у пулі (розмір {self.size})"
+                    )
+                self._waiters += 1
+                try:
+                    self._condition.wait(remaining)
+                finally:
+                    self._waiters -= 1
+            
+            if self._idle:
+                connection, last_used = self._idle.pop()
+            else:
+                connection, last_used = None, None
+                self._created += 1
+            self._in_use += 1
+            
+            waited = time.perf_counter() - started
+            self._checkouts += 1
+            self._wait_time += waited
+            self._max_wait_time = max(self._max_wait_time, waited)
+        
+        try:
+            if connection is None:
+                connection = self._connect()
+            elif time.monotonic() - last_used > self.ping_interval:
+                connection = self._check(connection)
+        except mysql.connector.Error:
+            self._forget()
+            raise
+        return connection
+    
+    def release(self, connection, discard=False):
+        """Повернення з'єднання у пул"""
+        if not discard:
+            try:
+                if connection.in_transaction:
+                    connection.rollback()
+            except mysql.connector.Error:
+                discard = True
+        
+        if discard:
+            try:
+                connection.close()
+            except mysql.connector.Error:
+                pass
+            self._forget()
+            return
+        
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            self._in_use -= 1
+            self._condition.notify()
+    
+    def _check(self, connection):
+        """Перевірка з'єднання, що довго простоювало, з перепідключенням"""
+        try:
+            connection.ping(reconnect=False)
+            return connection
+        except mysql.connector.Error:
+            try:
+                connection.close()
+            except mysql.connector.Error:
+                pass
+            with self._condition:
+                self._reconnects += 1
+            return self._connect()
+    
+    def _forget(self):
+        """Звільнення місця в пулі для нового з'єднання"""
+        with self._condition:
+            self._created -= 1
+            self._in_use -= 1
+            self._condition.notify()
+    
+    def close(self):
+        """Закриття всіх вільних з'єднань"""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+        for connection, _ in idle:
+            try:
+                connection.close()
+            except mysql.connector.Error:
+                pass
+    
+    def stats(self):
+        """Метрики пулу"""
+        with self._condition:
+            return {
+                'size': self.size,
+                'created': self._created,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'waiters': self._waiters,
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'reconnects': self._reconnects,
+                'wait_time_total': self._wait_time,
+                'wait_time_max': self._max_wait_time,
+                'wait_time_avg': self._wait_time / self._checkouts if self._checkouts else 0.0,
+            }
+
+
+class _TimedCursor:
+    """Обгортка курсора транзакції, що реєструє час кожного запиту в Database"""
+    
+    def __init__(self, cursor, db):
+        self._cursor = cursor
+        self._db = db
+    
+    def execute(self, query, params=None):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(query, params or ())
+        finally:
+            self._db._record_query(query, params, time.perf_counter() - started)
+    
+    def executemany(self, query, seq_params):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(query, seq_params)
+        finally:
+            self._db._record_query(query, None, time.perf_counter() - started)
+    
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class StatementCache:
+    """LRU-кеш серверних prepared statements одного з'єднання (ключ — текст запиту)
+    
+    Курсор MySQL Connector повторно готує запит, якщо отримав інший об'єкт рядка, тому разом
+    з курсором зберігається й перший об'єкт тексту запиту, який і передається в execute.
+    """
+    
+    def __init__(self, connection, max_size=64):
+        self.connection = connection
+        self.max_size = max_size
+        self._statements = OrderedDict()
+    
+    def get(self, query):
+        """(текст запиту, курсор, ознака влучання); витіснений курсор закриває statement на сервері"""
+        entry = self._statements.get(query)
+        if entry is not None:
+            self._statements.move_to_end(query)
+            return entry[0], entry[1], True
+        
+        cursor = self.connection.cursor(prepared=True, dictionary=True)
+        self._statements[query] = (query, cursor)
+        while len(self._statements) > self.max_size:
+            _, (_, evicted) = self._statements.popitem(last=False)
+            self._close(evicted)
+        return query, cursor, False
+    
+    def discard(self, query):
+        """Видалення statement після помилки виконання"""
+        entry = self._statements.pop(query, None)
+        if entry is not None:
+            self._close(entry[1])
+    
+    def __len__(self):
+        return len(self._statements)
+    
+    @staticmethod
+    def _close(cursor):
+        try:
+            cursor.close()
+        except mysql.connector.Error:
+            pass
+
+
 class Database:
     """Клас для роботи з базою даних MySQL"""
     
-    def __init__(self):
+    def __init__(self, pool_size=None, prepared=None, replicas=None):
         self.config = Config()
         self.connection = None
+        self.pool_size = self.config.DB_POOL_SIZE if pool_size is None else pool_size
+        self.prepared = self.config.DB_PREPARED_STATEMENTS if prepared is None else prepared
+        self._statement_stats = {'hits': 0, 'misses': 0}
+        self._statement_lock = threading.Lock()
+        self.pool = None
+        self._pool_lock = threading.Lock()
+        # Репліки працюють лише в режимі пулу; без пулу всі запити йдуть на основний сервер
+        self.replicas = [self._parse_host(host) for host in
+                         (self.config.MYSQL_REPLICAS if replicas is None else replicas)] if self.pool_size else []
+        self.replica_pools = None
+        self._replica_cursor = 0
+        self._routing = {'primary_reads': 0, 'replica_reads': 0, 'replica_failures': 0}
+        self._local = threading.local()
+        # Функції listener(query, elapsed), що викликаються після кожного запиту (метрики)
+        self.query_listeners = []
+        # Статистика HTTP-запиту в контекстній змінній: її бачать і async-представлення,
+        # які Flask виконує в окремому потоці з копією контексту
+        self._request_stats = contextvars.ContextVar(f'request_stats_{id(self)}', default=None)
+        # Закріплення читань за основним сервером — теж у контексті, щоб його враховував async_models
+        self._primary_until = contextvars.ContextVar(f'primary_until_{id(self)}', default=0)
+    
+    def _parse_host(self, host):
+        """Розбір "host:port" (порт за замовчуванням — як в основного сервера)"""
+        host, _, port = host.partition(':')
+        return host, int(port) if port else self.config.MYSQL_PORT
+    
+    def _open_connection(self, host=None, port=None):
+        """Відкриття нового з'єднання з MySQL (за замовчуванням — з основним сервером)"""
+        return mysql.connector.connect(
+            host=host or self.config.MYSQL_HOST,
+            user=self.config.MYSQL_USER,
+            password=self.config.MYSQL_PASSWORD,
+            database=self.config.MYSQL_DB,
+            port=port or self.config.MYSQL_PORT
+        )
+    
+    def _get_pool(self):
+        """Ліниве створення пулу з'єднань"""
+        if self.pool is None:
+            with self._pool_lock:
+                if self.pool is None:
+                    self.pool = ConnectionPool(
+                        self._open_connection,
+                        size=self.pool_size,
+                        timeout=self.config.DB_POOL_TIMEOUT,
+                        ping_interval=self.config.DB_POOL_PING_INTERVAL
+                    )
+        return self.pool
+    
+    def _get_replica_pools(self):
+        """Ліниве створення пулів реплік (по одному на репліку)"""
+        if self.replica_pools is None:
+            with self._pool_lock:
+                if self.replica_pools is None:
+                    self.replica_pools = [
+                        ConnectionPool(
+                            lambda host=host, port=port: self._open_connection(host, port),
+                            size=self.pool_size,
+                            timeout=self.config.DB_POOL_TIMEOUT,
+                            ping_interval=self.config.DB_POOL_PING_INTERVAL
+                        )
+                        for host, port in self.replicas
+                    ]
+        return self.replica_pools
+    
+    def _next_replica_pool(self):
+        """Пул наступної репліки (по колу)"""
+        pools = self._get_replica_pools()
+        with self._pool_lock:
+            self._replica_cursor = (self._replica_cursor + 1) % len(pools)
+            return pools[self._replica_cursor]
+    
+    def pin_primary(self, seconds):
+        """Читання поточного контексту з основного сервера протягом seconds (0 — знову з реплік)"""
+        self._primary_until.set(time.monotonic() + max(seconds, 0))
+    
+    def _mark_write(self):
+        """Після запису власні читання потоку йдуть на основний сервер (read-your-writes)"""
+        self._local.last_write = time.time()
+        if self.replicas:
+            self.pin_primary(self.config.DB_REPLICA_PIN_SECONDS)
+    
+    def pop_last_write(self):
+        """Час останнього запису в поточному потоці (None, якщо записів не було) зі скиданням"""
+        last_write = getattr(self._local, 'last_write', None)
+        self._local.last_write = None
+        return last_write
+    
+    def _reads_from_replica(self):
+        return bool(self.replicas) and time.monotonic() >= self._primary_until.get()
+    
+    def _count_read(self, key):
+        with self._pool_lock:
+            self._routing[key] += 1
+    
+    def get_read_connection(self):
+        """З'єднання для читання: репліка або основний сервер; (з'єднання, ознака репліки)
+        
+        Недоступна репліка не ламає запит — читання переходить на основний сервер.
+        """
+        if not self._reads_from_replica():
+            self._count_read('primary_reads')
+            return self.get_connection(), False
+        
+        checkout = getattr(self._local, 'replica', None)
+        if checkout is None:
+            pool = self._next_replica_pool()
+            try:
+                checkout = (pool, pool.acquire())
+            except mysql.connector.Error as err:
+                print(f"Репліка недоступна, читання з основного сервера: {err}")
+                self._count_read('replica_failures')
+                self._count_read('primary_reads')
+                return self.get_connection(), False
+            self._local.replica = checkout
+        self._count_read('replica_reads')
+        return checkout[1], True
+    
+    def release_replica(self, discard=False):
+        """Повернення з'єднання з реплікою поточного потоку"""
+        checkout = getattr(self._local, 'replica', None)
+        if checkout is not None:
+            self._local.replica = None
+            checkout[0].release(checkout[1], discard=discard)
     
     def connect(self):
         """Підключення до бази даних"""
         try:
-            self.connection = mysql.connector.connect(
-                host=self.config.MYSQL_HOST,
-                user=self.config.MYSQL_USER,
-                password=self.config.MYSQL_PASSWORD,
-                database=self.config.MYSQL_DB,
-                port=self.config.MYSQL_PORT
-            )
+            if self.pool_size:
+                # Перевіряємо доступність БД, одразу повертаючи з'єднання у пул
+                self.get_connection()
+                self.release()
+                return self.pool
+            self.connection = self._open_connection()
             return self.connection
         except mysql.connector.Error as err:
             print(f"Помилка підключення до БД: {err}")
@@ -27,28 +375,704 @@ class Database:
     
     def disconnect(self):
         """Відключення від бази даних"""
+        if self.pool is not None:
+            self.release()
+            self.pool.close()
+        for pool in self.replica_pools or []:
+            pool.close()
         if self.connection and self.connection.is_connected():
             self.connection.close()
     
-    def execute_query(self, query, params=None, fetch=False):
-        """Виконання SQL запиту"""
+    def get_connection(self):
+        """З'єднання поточного потоку (у режимі пулу береться з пулу до release)"""
+        if not self.pool_size:
+            if self.connection is None:
+                self.connection = self._open_connection()
+            return self.connection
+        
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._get_pool().acquire()
+            self._local.connection = connection
+        return connection
+    
+    def release(self, discard=False):
+        """Повернення з'єднань поточного потоку (викликається в кінці запиту)
+        
+        discard стосується з'єднання з основним сервером; з'єднання з реплікою просто повертається.
+        """
+        self.release_replica()
+        if not self.pool_size:
+            if discard and self.connection is not None:
+                try:
+                    self.connection.close()
+                except mysql.connector.Error:
+                    pass
+                self.connection = None
+            return
+        
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            self._local.connection = None
+            self.pool.release(connection, discard=discard)
+    
+    def fetch_multi(self, query, params=None):
+        """Виконання кількох SELECT одним зверненням до сервера; список результатів кожного"""
+        connection = None
+        replica = False
+        started = time.perf_counter()
+        try:
+            connection, replica = self.get_read_connection()
+            cursor = connection.cursor(dictionary=True)
+            results = []
+            for result in cursor.execute(query, params or (), multi=True):
+                results.append(result.fetchall() if result.with_rows else [])
+            cursor.close()
+            return results
+        except mysql.connector.Error as err:
+            print(f"Помилка виконання запиту: {err}")
+            if connection is not None:
+                self._discard(replica)
+            return None
+        finally:
+            self._record_query(query, params, time.perf_counter() - started)
+    
+    def stream_query(self, query, params=None, batch_size=500):
+        """Генератор рядків через небуферизований курсор на окремому з'єднанні
+        
+        Рядки читаються з сервера порціями по batch_size, тому пам'ять не залежить від розміру
+        результату. З'єднання не прив'язується до потоку і повертається, коли генератор завершено.
+        """
+        pool = None
+        connection = None
+        cursor = None
+        finished = False
         try:
-            cursor = self.connection.cursor(dictionary=True)
+            if self._reads_from_replica():
+                pool = self._next_replica_pool()
+                try:
+                    connection = pool.acquire()
+                except mysql.connector.Error as err:
+                    print(f"Репліка недоступна, читання з основного сервера: {err}")
+                    pool = None
+            if pool is None:
+                pool = self._get_pool() if self.pool_size else None
+                connection = pool.acquire() if pool else self._open_connection()
+            cursor = connection.cursor(dictionary=True, buffered=False)
+            started = time.perf_counter()
             cursor.execute(query, params or ())
-            
-            if fetch:
-                result = cursor.fetchall()
-                cursor.close()
-                return result
-            else:
-                self.connection.commit()
-                last_id = cursor.lastrowid
-                cursor.close()
-                return last_id
+            self._record_query(query, params, time.perf_counter() - started)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+            finished = True
         except mysql.connector.Error as err:
+            # Помилку не ковтаємо: інакше клієнт отримав би обрізаний файл з кодом 200
             print(f"Помилка виконання запиту: {err}")
-            self.connection.rollback()
+            raise
+        finally:
+            # Недочитаний результат (клієнт перервав завантаження) робить з'єднання непридатним
+            if finished:
+                cursor.close()
+            if connection is not None:
+                if pool:
+                    pool.release(connection, discard=not finished)
+                else:
+                    connection.close()
+    
+    @contextmanager
+    def transaction(self):
+        """Явна транзакція: коміт при успіху, відкат при будь-якій помилці"""
+        connection = self.get_connection()
+        if connection.in_transaction:
+            # Завершуємо неявну транзакцію попередніх SELECT-ів
+            connection.commit()
+        cursor = connection.cursor(dictionary=True)
+        try:
+            yield _TimedCursor(cursor, self)
+            connection.commit()
+            self._mark_write()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    def start_request_stats(self):
+        """Початок підрахунку запитів і часу БД для поточного контексту (HTTP-запиту)"""
+        self._request_stats.set({'queries': 0, 'db_time': 0.0})
+    
+    def pop_request_stats(self):
+        """Кількість запитів і сумарний час БД з моменту start_request_stats"""
+        stats = self._request_stats.get()
+        self._request_stats.set(None)
+        return stats or {'queries': 0, 'db_time': 0.0}
+    
+    @contextmanager
+    def capture_queries(self):
+        """Список (запит, параметри) усіх запитів потоку в межах блоку (перевірка планів запитів)"""
+        captured = []
+        self._local.captured = captured
+        try:
+            yield captured
+        finally:
+            self._local.captured = None
+    
+    def _record_query(self, query, params, elapsed):
+        """Облік виконаного запиту: статистика запиту, слухачі, журнал повільних запитів"""
+        stats = self._request_stats.get()
+        if stats is not None:
+            stats['queries'] += 1
+            stats['db_time'] += elapsed
+        
+        captured = getattr(self._local, 'captured', None)
+        if captured is not None:
+            captured.append((query, params))
+        
+        for listener in self.query_listeners:
+            listener(query, elapsed)
+        
+        if elapsed * 1000 >= self.config.SLOW_QUERY_MS:
+            # Значення параметрів не журналюються: вони можуть містити персональні дані
+            logger.warning("Повільний запит (%.1f мс, параметрів: %d): %s",
+                           elapsed * 1000, len(params or ()), ' '.join(query.split()))
+    
+    def _discard(self, replica):
+        """Закриття з'єднання, на якому сталася помилка (репліки або основного сервера)"""
+        if replica:
+            self.release_replica(discard=True)
+        else:
+            self.release(discard=True)
+    
+    def routing_stats(self):
+        """Кількість читань з реплік і з основного сервера та відмов реплік"""
+        with self._pool_lock:
+            return dict(self._routing, replicas=len(self.replicas))
+    
+    def pool_stats(self):
+        """Метрики пулу з'єднань (None, якщо пул вимкнено)"""
+        return self.pool.stats() if self.pool is not None else None
+    
+    def _prepared_cursor(self, connection, query):
+        """Prepared-курсор з кешу з'єднання (кеш зберігається на самому об'єкті з'єднання)"""
+        statements = getattr(connection, '_unimeet_statements', None)
+        if statements is None:
+            statements = StatementCache(connection, self.config.DB_PREPARED_CACHE_SIZE)
+            connection._unimeet_statements = statements
+        query, cursor, hit = statements.get(query)
+        with self._statement_lock:
+            self._statement_stats['hits' if hit else 'misses'] += 1
+        return query, cursor
+    
+    def statement_stats(self):
+        """Влучання та промахи кешу prepared statements (None, якщо режим вимкнено)"""
+        if not self.prepared:
             return None
+        with self._statement_lock:
+            stats = dict(self._statement_stats)
+        total = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = stats['hits'] / total if total else 0.0
+        return stats
+    
+    def execute_query(self, query, params=None, fetch=False):
+        """Виконання SQL запиту"""
+        retry = True
+        # Час повтору після втраченого з'єднання входить у час того самого запиту
+        started = time.perf_counter()
+        while True:
+            connection = None
+            replica = False
+            committing = False
+            retrying = False
+            try:
+                if fetch:
+                    connection, replica = self.get_read_connection()
+                else:
+                    connection = self.get_connection()
+                if self.prepared:
+                    # Курсор лишається в кеші з'єднання, тому не закривається
+                    query, cursor = self._prepared_cursor(connection, query)
+                else:
+                    cursor = connection.cursor(dictionary=True)
+                cursor.execute(query, params or ())
+                
+                if fetch:
+                    result = cursor.fetchall()
+                    if not self.prepared:
+                        cursor.close()
+                    return result
+                else:
+                    committing = True
+                    connection.commit()
+                    self._mark_write()
+                    last_id = cursor.lastrowid
+                    if not self.prepared:
+                        cursor.close()
+                    return last_id
+            except mysql.connector.Error as err:
+                if self.prepared and connection is not None:
+                    statements = getattr(connection, '_unimeet_statements', None)
+                    if statements is not None:
+                        statements.discard(query)
+                # Розірване до коміту з'єднання замінюємо новим і повторюємо запит один раз
+                if retry and not committing and err.errno in CONNECTION_LOST_ERRORS:
+                    retry = False
+                    retrying = True
+                    self._discard(replica)
+                    continue
+                print(f"Помилка виконання запиту: {err}")
+                if connection is not None:
+                    try:
+                        connection.rollback()
+                    except mysql.connector.Error:
+                        self._discard(replica)
+                return None
+            finally:
+                # Повторена спроба обліковується один раз — після її завершення
+                if not retrying:
+                    self._record_query(query, params, time.perf_counter() - started)
+
+
+class MemoryCacheBackend:
+    """In-process LRU-сховище кешу з TTL (окреме для кожного процесу)"""
+    
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Значення та ознака наявності (прострочені записи видаляються)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None, False
+            self._entries.move_to_end(key)
+            return value, True
+    
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl if ttl else None)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """Спільне для всіх воркерів сховище кешу у локальному файлі SQLite"""
+    
+    def __init__(self, path, max_entries=1024):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, expires_at REAL)"
+        )
+    
+    def _connection(self):
+        """Окреме з'єднання SQLite для кожного потоку"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+    
+    def get(self, key):
+        row = self._connection().execute(
+            "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None, False
+        if row[1] is not None and row[1] <= time.time():
+            self.delete(key)
+            return None, False
+        return pickle.loads(row[0]), True
+    
+    def set(self, key, value, ttl=None):
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, pickle.dumps(value), time.time() + ttl if ttl else None)
+        )
+        connection.execute(
+            "DELETE FROM cache WHERE key NOT IN (SELECT key FROM cache ORDER BY rowid DESC LIMIT ?)",
+            (self.max_entries,)
+        )
+    
+    def delete(self, *keys):
+        connection = self._connection()
+        for key in keys:
+            connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+    
+    def clear(self):
+        self._connection().execute("DELETE FROM cache")
+    
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+class Cache:
+    """Read-through кеш з TTL, явною інвалідацією та лічильниками влучань"""
+    
+    def __init__(self, backend, ttl=300):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+    
+    def get(self, key):
+        """Пара (значення, знайдено) з урахуванням у лічильниках"""
+        value, found = self.backend.get(key)
+        with self._lock:
+            if found:
+                self._hits += 1
+            else:
+                self._misses += 1
+        return value, found
+    
+    def set(self, key, value, ttl=None):
+        """Збереження значення (None не кешується — це помилка БД)"""
+        if value is not None:
+            self.backend.set(key, value, self.ttl if ttl is None else ttl)
+    
+    def get_or_load(self, key, loader, ttl=None):
+        """Значення з кешу або результат loader()"""
+        value, found = self.get(key)
+        if found:
+            return value
+        
+        value = loader()
+        self.set(key, value, ttl)
+        return value
+    
+    def invalidate(self, *keys):
+        """Видалення записів після зміни даних"""
+        self.backend.delete(*keys)
+    
+    def clear(self):
+        self.backend.clear()
+    
+    def stats(self):
+        """Лічильники влучань і промахів"""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                'backend': type(self.backend).__name__,
+                'entries': len(self.backend),
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / total if total else 0.0,
+            }
+
+
+def create_cache(config=Config):
+    """Кеш з бекендом, обраним у конфігурації"""
+    if config.CACHE_BACKEND == 'sqlite':
+        backend = SQLiteCacheBackend(config.CACHE_PATH, max_entries=config.CACHE_MAX_ENTRIES)
+    else:
+        backend = MemoryCacheBackend(max_entries=config.CACHE_MAX_ENTRIES)
+    return Cache(backend, ttl=config.CACHE_TTL)
+
+
+# Кеш довідкових даних (категорії, університети)
+cache = create_cache()
+
+# Готові сторінки списків подій для анонімних відвідувачів (див. app.py)
+page_cache = Cache(MemoryCacheBackend(max_entries=Config.PAGE_CACHE_MAX_ENTRIES), ttl=Config.PAGE_CACHE_TTL)
+
+
+def invalidate_event_pages():
+    """Скидання кешу сторінок після змін, видимих у списках подій"""
+    page_cache.clear()
+
+
+class SearchIndex:
+    """In-process інвертований індекс подій (замінник MySQL FULLTEXT для локального тестування)"""
+    
+    # Вага збігу в кожному полі
+    FIELD_WEIGHTS = {'title': 3.0, 'description': 1.0, 'category_name': 1.5, 'organizer_name': 1.5}
+    
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self.built_at = None
+        self._postings = {}
+        self._documents = {}
+        self._lock = threading.RLock()
+    
+    @staticmethod
+    def tokenize(text):
+        """Слова тексту в нижньому регістрі (будь-яка абетка, зокрема кирилиця)"""
+        return [token for token in re.findall(r'\w+', (text or '').casefold()) if len(token) > 1]
+    
+    def is_stale(self):
+        return self.built_at is None or time.time() - self.built_at > self.ttl
+    
+    def invalidate(self):
+        self.built_at = None
+    
+    def build(self, events):
+        """Повна перебудова індексу з рядків подій"""
+        with self._lock:
+            self._postings = {}
+            self._documents = {}
+            for event in events:
+                self._add(event)
+            self.built_at = time.time()
+    
+    def add(self, event):
+        """Додавання або оновлення однієї події"""
+        with self._lock:
+            self._remove(event['id'])
+            self._add(event)
+    
+    def remove(self, event_id):
+        with self._lock:
+            self._remove(event_id)
+    
+    def _add(self, event):
+        weights = {}
+        for field, weight in self.FIELD_WEIGHTS.items():
+            for token in self.tokenize(event.get(field)):
+                weights[token] = weights.get(token, 0.0) + weight
+        for token, weight in weights.items():
+            self._postings.setdefault(token, {})[event['id']] = weight
+        self._documents[event['id']] = (event.get('status'), event.get('category_id'), list(weights))
+    
+    def _remove(self, event_id):
+        document = self._documents.pop(event_id, None)
+        if document is None:
+            return
+        for token in document[2]:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(event_id, None)
+                if not postings:
+                    del self._postings[token]
+    
+    def search(self, query, status=None, category_id=None, offset=0, limit=10):
+        """Ідентифікатори подій за спаданням релевантності (TF-IDF з вагами полів)"""
+        with self._lock:
+            total = len(self._documents) or 1
+            scores = {}
+            for token in set(self.tokenize(query)):
+                postings = self._postings.get(token)
+                if not postings:
+                    continue
+                idf = math.log(1 + total / len(postings))
+                for event_id, weight in postings.items():
+                    scores[event_id] = scores.get(event_id, 0.0) + weight * idf
+            
+            # Нечислове значення ?category= з адреси ігнорується, а не дає помилку 500
+            category_id = int(category_id) if str(category_id or '').isdigit() else None
+            if status or category_id:
+                scores = {
+                    event_id: score for event_id, score in scores.items()
+                    if (not status or self._documents[event_id][0] == status)
+                    and (not category_id or self._documents[event_id][1] == category_id)
+                }
+            
+            best = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], item[0]))
+            return [event_id for event_id, _ in best[offset:]]
+
+
+# Індекс для SEARCH_BACKEND = 'memory' (будується ліниво при першому пошуку)
+search_index = SearchIndex(ttl=Config.SEARCH_INDEX_TTL)
+
+
+class PrefixIndex:
+    """Відсортований масив нормалізованих суфіксів назв для пошуку за префіксом слова (bisect)
+    
+    Кожна назва індексується з початку кожного слова, тому «київ» знаходить
+    і «Київський національний...», і «Національний ... "Київський політехнічний інститут"».
+    """
+    
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self.built_at = None
+        self._keys = []
+        self._positions = []
+        self._names = []
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def normalize(text):
+        """Нижній регістр без діакритики, апострофів і лапок («Ї» -> «і», «й» -> «и»)"""
+        decomposed = unicodedata.normalize('NFKD', (text or '').casefold())
+        stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+        return re.sub(r"[\'’ʼ`\"«»]", '', stripped)
+    
+    def is_stale(self):
+        return self.built_at is None or time.time() - self.built_at > self.ttl
+    
+    def invalidate(self):
+        self.built_at = None
+    
+    def build(self, names):
+        """Побудова індексу зі списку назв"""
+        names = list(dict.fromkeys(name for name in names if name))
+        entries = []
+        for position, name in enumerate(names):
+            normalized = self.normalize(name)
+            for match in re.finditer(r'\w+', normalized):
+                entries.append((normalized[match.start():], position))
+        entries.sort()
+        with self._lock:
+            self._keys = [key for key, _ in entries]
+            self._positions = [position for _, position in entries]
+            self._names = names
+            self.built_at = time.time()
+    
+    def search(self, prefix, limit=10):
+        """Назви, в яких якесь слово починається з prefix (спершу збіг з початку назви)"""
+        prefix = self.normalize(prefix).strip()
+        if not prefix:
+            return []
+        
+        with self._lock:
+            keys, positions, names = self._keys, self._positions, self._names
+        
+        starts, others = [], []
+        seen = set()
+        index = bisect_left(keys, prefix)
+        while index < len(keys) and keys[index].startswith(prefix) and len(starts) < limit:
+            position = positions[index]
+            if position not in seen:
+                seen.add(position)
+                full = self.normalize(names[position])
+                (starts if full.startswith(prefix) else others).append(names[position])
+            index += 1
+        return (starts + others)[:limit]
+
+
+# Індекс автодоповнення університетів (будується ліниво з User.get_universities)
+university_index = PrefixIndex(ttl=Config.CACHE_TTL)
+
+
+def _escape_like(text):
+    """Екранування спецсимволів шаблону LIKE"""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _bump_data_version(db, name):
+    """Збільшення версії даних (змінює ETag сторінок, що від неї залежать)"""
+    db.execute_query("""
+        INSERT INTO data_versions (name, version) VALUES (%s, 1)
+        ON DUPLICATE KEY UPDATE version = version + 1
+    """, (name,))
+
+
+REGISTRATION_STATUSES = ('registered', 'attended', 'cancelled')
+
+
+def _status_delta(old_status, new_status):
+    """Зміни лічильників event_registration_stats при переході реєстрації між статусами"""
+    delta = dict.fromkeys(REGISTRATION_STATUSES, 0)
+    if old_status:
+        delta[old_status] -= 1
+    delta[new_status] += 1
+    return delta
+
+
+def _adjust_registration_stats(cursor, event_id, delta, signup=False):
+    """Оновлення лічильників реєстрацій події в транзакції, що змінює реєстрації
+
+    signup — нова (або відновлена) реєстрація, оновлює час останньої реєстрації.
+    """
+    cursor.execute("""
+        INSERT INTO event_registration_stats
+            (event_id, registered_count, attended_count, cancelled_count, last_registration_at)
+        VALUES (%s, %s, %s, %s, IF(%s, NOW(), NULL))
+        ON DUPLICATE KEY UPDATE
+            registered_count = registered_count + VALUES(registered_count),
+            attended_count = attended_count + VALUES(attended_count),
+            cancelled_count = cancelled_count + VALUES(cancelled_count),
+            last_registration_at = IF(%s, NOW(), last_registration_at)
+    """, (event_id, delta['registered'], delta['attended'], delta['cancelled'], signup, signup))
+
+
+def _encode_cursor(moment, row_id):
+    """Курсор keyset-пагінації з пари (дата, id)"""
+    return f"{moment:%Y-%m-%dT%H:%M:%S}_{row_id}"
+
+
+def _decode_cursor(cursor):
+    """Розбір курсора; None для порожнього або пошкодженого значення"""
+    if not cursor:
+        return None
+    try:
+        moment, row_id = cursor.rsplit('_', 1)
+        return datetime.strptime(moment, '%Y-%m-%dT%H:%M:%S'), int(row_id)
+    except ValueError:
+        return None
+
+
+# Запити читання, спільні для синхронних моделей і async_models
+USER_BY_ID_QUERY = "SELECT * FROM users WHERE id = %s"
+
+EVENT_BY_ID_QUERY = """
+    SELECT e.*, c.name as category_name, u.full_name as organizer_name, u.email as organizer_email
+    FROM events e
+    LEFT JOIN event_categories c ON e.category_id = c.id
+    LEFT JOIN users u ON e.organizer_id = u.id
+    WHERE e.id = %s
+"""
+
+EVENTS_BY_ORGANIZER_QUERY = """
+    SELECT e.*, c.name as category_name
+    FROM events e
+    LEFT JOIN event_categories c ON e.category_id = c.id
+    WHERE e.organizer_id = %s
+    ORDER BY e.event_date DESC
+"""
+
+REGISTRATIONS_BY_USER_QUERY = """
+    SELECT r.*, e.title, e.event_date, e.location, e.status as event_status
+    FROM registrations r
+    JOIN events e ON r.event_id = e.id
+    WHERE r.user_id = %s
+    ORDER BY r.registration_date DESC
+"""
+
+REGISTRATIONS_BY_EVENT_QUERY = """
+    SELECT r.*, u.full_name, u.email, u.university
+    FROM registrations r
+    JOIN users u ON r.user_id = u.id
+    WHERE r.event_id = %s
+    ORDER BY r.registration_date ASC
+"""
+
+REGISTRATION_CHECK_QUERY = "SELECT * FROM registrations WHERE event_id = %s AND user_id = %s"
+
+CATEGORIES_QUERY = "SELECT * FROM event_categories ORDER BY name ASC"
+
+RATING_AVERAGE_QUERY = """
+    SELECT rating_sum / NULLIF(rating_count, 0) as avg_rating, rating_count as count
+    FROM events WHERE id = %s
+"""
+
+
+# Поля префіксного пошуку в довіднику користувачів (кожне має індекси (поле) і (role, поле))
+USER_SEARCH_FIELDS = ('full_name', 'email', 'university')
 
 
 class User:
@@ -59,36 +1083,135 @@ class User:
     
     def create(self, email, password, full_name, role='student', university=None):
         """Створення нового користувача"""
-        password_hash = generate_password_hash(password)
+        password_hash = password_hasher.hash(password)
         query = """
             INSERT INTO users (email, password_hash, full_name, role, university)
             VALUES (%s, %s, %s, %s, %s)
         """
-        return self.db.execute_query(query, (email, password_hash, full_name, role, university))
+        user_id = self.db.execute_query(query, (email, password_hash, full_name, role, university))
+        if user_id:
+            self._track_university(university)
+        return user_id
     
     def get_by_id(self, user_id):
         """Отримання користувача за ID"""
-        query = "SELECT * FROM users WHERE id = %s"
-        result = self.db.execute_query(query, (user_id,), fetch=True)
+        result = self.db.execute_query(USER_BY_ID_QUERY, (user_id,), fetch=True)
         return result[0] if result else None
     
+    def get_principal(self, user_id):
+        """Публічні дані користувача для авторизації (кешуються на PRINCIPAL_CACHE_TTL секунд)"""
+        query = "SELECT id, email, full_name, role, university, created_at FROM users WHERE id = %s"
+        
+        def load():
+            result = self.db.execute_query(query, (user_id,), fetch=True)
+            return result[0] if result else None
+        
+        return cache.get_or_load(f'user:{user_id}', load, ttl=Config.PRINCIPAL_CACHE_TTL)
+    
+    def invalidate_principal(self, user_id):
+        """Скидання кешованих даних користувача після зміни"""
+        cache.invalidate(f'user:{user_id}')
+    
     def get_by_email(self, email):
         """Отримання користувача за email"""
         query = "SELECT * FROM users WHERE email = %s"
         result = self.db.execute_query(query, (email,), fetch=True)
         return result[0] if result else None
     
+    def get_by_emails(self, emails, chunk_size=1000):
+        """Пакетне отримання користувачів за email: словник email у нижньому регістрі -> користувач"""
+        users = {}
+        emails = list(emails)
+        for start in range(0, len(emails), chunk_size):
+            chunk = emails[start:start + chunk_size]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            query = f"SELECT id, email, full_name FROM users WHERE email IN ({placeholders})"
+            result = self.db.execute_query(query, tuple(chunk), fetch=True)
+            if result is None:
+                return None
+            for user in result:
+                users[user['email'].lower()] = user
+        return users
+    
     def verify_password(self, user, password):
-        """Перевірка пароля користувача"""
-        return check_password_hash(user['password_hash'], password)
+        """Перевірка пароля користувача з оновленням хешу, збереженого із застарілими параметрами"""
+        if not password_hasher.verify(user['password_hash'], password):
+            return False
+        if password_hasher.needs_rehash(user['password_hash']):
+            self.db.execute_query("UPDATE users SET password_hash = %s WHERE id = %s",
+                                  (password_hasher.hash(password), user['id']))
+        return True
     
     def get_all(self):
         """Отримання всіх користувачів"""
         query = "SELECT id, email, full_name, role, university, created_at FROM users ORDER BY created_at DESC"
         return self.db.execute_query(query, fetch=True)
     
+    def get_page(self, search=None, role=None, cursor=None, direction='next', per_page=20, field='full_name'):
+        """Сторінка довідника користувачів з фільтром ролі та префіксним пошуком
+        
+        Без пошуку — від новіших до старіших, keyset за (created_at, id). З пошуком — за алфавітом
+        у полі field (full_name, email або university), keyset за (field, id): префіксний діапазон
+        індексу (field) чи (role, field) уже впорядкований, тому сторінка читає per_page рядків
+        незалежно від кількості збігів. Курсор — id крайнього рядка сторінки.
+        Повертає словник з users, next_cursor і prev_cursor.
+        """
+        if field not in USER_SEARCH_FIELDS:
+            field = 'full_name'
+        column, ascending = (field, True) if search else ('created_at', False)
+        
+        query = "SELECT id, email, full_name, role, university, created_at FROM users WHERE 1=1"
+        params = []
+        
+        if search:
+            query += f" AND {column} LIKE %s"
+            params.append(_escape_like(search) + '%')
+        
+        if role:
+            query += " AND role = %s"
+            params.append(role)
+        
+        boundary = None
+        if cursor and str(cursor).isdigit():
+            result = self.db.execute_query(f"SELECT id, {column} as value FROM users WHERE id = %s",
+                                           (int(cursor),), fetch=True)
+            if result is None:
+                return None
+            boundary = result[0] if result else None
+        backwards = boundary is not None and direction == 'prev'
+        if backwards:
+            ascending = not ascending
+        if boundary:
+            sign = '>' if ascending else '<'
+            query += f" AND ({column} {sign} %s OR ({column} = %s AND id {sign} %s))"
+            params.extend([boundary['value'], boundary['value'], boundary['id']])
+        
+        order = 'ASC' if ascending else 'DESC'
+        query += f" ORDER BY {column} {order}, id {order} LIMIT %s"
+        params.append(per_page + 1)
+        
+        users = self.db.execute_query(query, tuple(params), fetch=True)
+        if users is None:
+            return None
+        has_more = len(users) > per_page
+        users = users[:per_page]
+        if backwards:
+            users.reverse()
+        
+        has_next = True if backwards else has_more
+        has_prev = has_more if backwards else boundary is not None
+        return {
+            'users': users,
+            'next_cursor': str(users[-1]['id']) if users and has_next else None,
+            'prev_cursor': str(users[0]['id']) if users and has_prev else None,
+        }
+    
     def get_universities(self):
-        """Отримання списку університетів"""
+        """Отримання списку університетів (кешується)"""
+        return cache.get_or_load('universities:all', self._load_universities)
+    
+    def _load_universities(self):
+        """Завантаження списку університетів з БД"""
         query = "SELECT name as university FROM universities ORDER BY name"
         result = self.db.execute_query(query, fetch=True)
         
@@ -98,6 +1221,25 @@ class User:
         
         return result
     
+    def _track_university(self, university):
+        """Новий університет користувача може змінити запасний список (DISTINCT з users)"""
+        if university and not any(u['university'] == university for u in self.get_universities() or []):
+            self.invalidate_universities()
+    
+    def invalidate_universities(self):
+        """Скидання кешу університетів (після зміни довідника або університету користувача)"""
+        cache.invalidate('universities:all')
+        university_index.invalidate()
+    
+    def suggest_universities(self, prefix, limit=10):
+        """Автодоповнення назви університету за префіксом слова"""
+        if university_index.is_stale():
+            universities = self.get_universities()
+            if universities is None:
+                return None
+            university_index.build(u['university'] for u in universities)
+        return university_index.search(prefix, limit)
+    
     def update_role(self, user_id, new_role):
         """Оновлення ролі користувача"""
         valid_roles = ['student', 'organizer', 'admin']
@@ -106,6 +1248,7 @@ class User:
         
         query = "UPDATE users SET role = %s WHERE id = %s"
         self.db.execute_query(query, (new_role, user_id))
+        self.invalidate_principal(user_id)
         return True
     
     def update_user(self, user_id, email=None, full_name=None, university=None, role=None):
@@ -134,7 +1277,15 @@ class User:
         
         params.append(user_id)
         query = f"UPDATE users SET {', '.join(updates)} WHERE id = %s"
-        return self.db.execute_query(query, tuple(params)) is not None
+        if self.db.execute_query(query, tuple(params)) is None:
+            return False
+        self.invalidate_principal(user_id)
+        self._track_university(university)
+        if full_name:
+            # Ім'я організатора та авторів коментарів показується на сторінках подій
+            _bump_data_version(self.db, 'events')
+            invalidate_event_pages()
+        return True
 
 
 class Event:
@@ -147,28 +1298,78 @@ class Event:
                registration_deadline, max_participants=100, image_url=None, is_online=False, online_link=None):
         """Створення нової події"""
         query = """
-            INSERT INTO events (title, description, category_id, organizer_id, location, 
+            INSERT INTO events (title, description, category_id, organizer_id, location, is_online, online_link,
                                event_date, registration_deadline, max_participants, image_url)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
-        return self.db.execute_query(query, (title, description, category_id, organizer_id, 
-                                             location, event_date, registration_deadline, 
-                                             max_participants, image_url))
+        event_id = self.db.execute_query(query, (title, description, category_id, organizer_id, 
+                                                 location, bool(is_online), online_link or None,
+                                                 event_date, registration_deadline,
+                                                 max_participants, image_url))
+        if event_id:
+            self._reindex(event_id)
+        return event_id
+    
+    def _reindex(self, event_id):
+        """Оновлення кешу сторінок та in-process пошукового індексу після зміни події"""
+        invalidate_event_pages()
+        if Config.SEARCH_BACKEND != 'memory' or search_index.built_at is None:
+            return
+        event = self.get_by_id(event_id)
+        if event:
+            search_index.add(event)
+        else:
+            search_index.remove(event_id)
     
     def get_by_id(self, event_id):
         """Отримання події за ID"""
+        result = self.db.execute_query(EVENT_BY_ID_QUERY, (event_id,), fetch=True)
+        return result[0] if result else None
+    
+    def load_detail(self, event_id, user_id=None, comments_per_page=20):
+        """Усі дані сторінки події за одне звернення до БД
+        
+        Повертає словник з event, comments (перша сторінка), comments_cursor, rating_data,
+        registration або None, якщо подію не знайдено.
+        Рейтинг береться зі збережених у події rating_sum/rating_count.
+        """
         query = """
             SELECT e.*, c.name as category_name, u.full_name as organizer_name, u.email as organizer_email
             FROM events e
             LEFT JOIN event_categories c ON e.category_id = c.id
             LEFT JOIN users u ON e.organizer_id = u.id
-            WHERE e.id = %s
+            WHERE e.id = %s;
+            SELECT c.*, u.full_name
+            FROM comments c
+            JOIN users u ON c.user_id = u.id
+            WHERE c.event_id = %s
+            ORDER BY c.created_at DESC, c.id DESC
+            LIMIT %s;
+            SELECT * FROM registrations WHERE event_id = %s AND user_id = %s
         """
-        result = self.db.execute_query(query, (event_id,), fetch=True)
-        return result[0] if result else None
+        results = self.db.fetch_multi(query, (event_id, event_id, comments_per_page + 1, event_id, user_id))
+        if not results or not results[0]:
+            return None
+        
+        event, comments, registration = results
+        event = event[0]
+        comment_page = _comment_page(comments, comments_per_page)
+        return {
+            'event': event,
+            'comments': comment_page['comments'],
+            'comments_cursor': comment_page['next_cursor'],
+            'rating_data': {
+                'avg_rating': event['rating_sum'] / event['rating_count'] if event['rating_count'] else 0,
+                'count': event['rating_count'],
+            },
+            'registration': registration[0] if registration else None,
+        }
     
-    def get_all(self, status=None, category_id=None, limit=None):
-        """Отримання всіх подій з фільтрацією"""
+    def get_all(self, status=None, category_id=None, limit=None, after=None, before=None):
+        """Отримання всіх подій з фільтрацією
+        
+        after/before — ключ (event_date, id), від якого починається сторінка (keyset-пагінація).
+        """
         query = """
             SELECT e.*, c.name as category_name, u.full_name as organizer_name
             FROM events e
@@ -186,29 +1387,139 @@ class Event:
             query += " AND e.category_id = %s"
             params.append(category_id)
         
-        query += " ORDER BY e.event_date ASC"
+        if after:
+            query += " AND (e.event_date > %s OR (e.event_date = %s AND e.id > %s))"
+            params.extend([after[0], after[0], after[1]])
+        
+        if before:
+            query += " AND (e.event_date < %s OR (e.event_date = %s AND e.id < %s))"
+            params.extend([before[0], before[0], before[1]])
+            query += " ORDER BY e.event_date DESC, e.id DESC"
+        else:
+            query += " ORDER BY e.event_date ASC, e.id ASC"
         
         if limit:
             query += " LIMIT %s"
             params.append(limit)
         
-        return self.db.execute_query(query, tuple(params) if params else None, fetch=True)
+        result = self.db.execute_query(query, tuple(params) if params else None, fetch=True)
+        if before and result:
+            result.reverse()
+        return result
+    
+    def get_page(self, status=None, category_id=None, cursor=None, direction='next', per_page=10):
+        """Сторінка подій з курсорами на попередню та наступну сторінки"""
+        key = _decode_cursor(cursor)
+        backwards = key is not None and direction == 'prev'
+        
+        # Беремо на один рядок більше, щоб знати, чи є ще сторінка в цьому напрямку
+        events = self.get_all(status, category_id, limit=per_page + 1,
+                              after=None if backwards else key,
+                              before=key if backwards else None) or []
+        has_more = len(events) > per_page
+        events = events[-per_page:] if backwards else events[:per_page]
+        
+        has_next = True if backwards else has_more
+        has_prev = has_more if backwards else key is not None
+        return {
+            'events': events,
+            'next_cursor': _encode_cursor(events[-1]['event_date'], events[-1]['id']) if events and has_next else None,
+            'prev_cursor': _encode_cursor(events[0]['event_date'], events[0]['id']) if events and has_prev else None,
+        }
     
     def get_by_organizer(self, organizer_id):
         """Отримання подій організатора"""
+        return self.db.execute_query(EVENTS_BY_ORGANIZER_QUERY, (organizer_id,), fetch=True)
+    
+    def get_dashboard_page(self, organizer_id=None, cursor=None, direction='next', per_page=20):
+        """Сторінка подій панелі організатора з лічильниками реєстрацій за статусами
+        
+        Лічильники читаються з event_registration_stats, тож сторінка не залежить від кількості
+        реєстрацій; organizer_id=None — усі події (адміністратор). Повертає словник з events,
+        next_cursor і prev_cursor; у кожної події є active_count і fill_rate.
+        """
         query = """
-            SELECT e.*, c.name as category_name
+            SELECT e.id, e.title, e.event_date, e.status, e.max_participants,
+                   COALESCE(s.registered_count, 0) as registered_count,
+                   COALESCE(s.attended_count, 0) as attended_count,
+                   COALESCE(s.cancelled_count, 0) as cancelled_count,
+                   s.last_registration_at
             FROM events e
-            LEFT JOIN event_categories c ON e.category_id = c.id
-            WHERE e.organizer_id = %s
-            ORDER BY e.event_date DESC
+            LEFT JOIN event_registration_stats s ON s.event_id = e.id
+            WHERE 1=1
+        """
+        params = []
+        if organizer_id is not None:
+            query += " AND e.organizer_id = %s"
+            params.append(organizer_id)
+        
+        key = _decode_cursor(cursor)
+        backwards = key is not None and direction == 'prev'
+        if key:
+            sign = '>' if backwards else '<'
+            query += f" AND (e.event_date {sign} %s OR (e.event_date = %s AND e.id {sign} %s))"
+            params.extend([key[0], key[0], key[1]])
+        
+        order = 'ASC' if backwards else 'DESC'
+        query += f" ORDER BY e.event_date {order}, e.id {order} LIMIT %s"
+        params.append(per_page + 1)
+        
+        events = self.db.execute_query(query, tuple(params), fetch=True)
+        if events is None:
+            return None
+        has_more = len(events) > per_page
+        events = events[:per_page]
+        if backwards:
+            events.reverse()
+        for event in events:
+            event['active_count'] = event['registered_count'] + event['attended_count']
+            event['fill_rate'] = event['active_count'] / event['max_participants'] if event['max_participants'] else 0
+        
+        has_next = True if backwards else has_more
+        has_prev = has_more if backwards else key is not None
+        return {
+            'events': events,
+            'next_cursor': _encode_cursor(events[-1]['event_date'], events[-1]['id']) if events and has_next else None,
+            'prev_cursor': _encode_cursor(events[0]['event_date'], events[0]['id']) if events and has_prev else None,
+        }
+    
+    def get_dashboard_totals(self, organizer_id=None):
+        """Підсумки панелі: кількість подій, місць і реєстрацій за статусами
+        
+        Агрегат охоплює всі події організатора (для адміністратора — усі), тому кешується
+        на DASHBOARD_TOTALS_TTL секунд; невдалий запит не кешується.
         """
-        return self.db.execute_query(query, (organizer_id,), fetch=True)
+        key = f"dashboard_totals:{'all' if organizer_id is None else organizer_id}"
+        totals, found = cache.get(key)
+        if found:
+            return totals
+        
+        query = """
+            SELECT COUNT(*) as events, COALESCE(SUM(e.max_participants), 0) as capacity,
+                   COALESCE(SUM(s.registered_count), 0) as registered_count,
+                   COALESCE(SUM(s.attended_count), 0) as attended_count,
+                   COALESCE(SUM(s.cancelled_count), 0) as cancelled_count
+            FROM events e
+            LEFT JOIN event_registration_stats s ON s.event_id = e.id
+        """
+        params = ()
+        if organizer_id is not None:
+            query += " WHERE e.organizer_id = %s"
+            params = (organizer_id,)
+        result = self.db.execute_query(query, params, fetch=True)
+        if not result:
+            return None
+        totals = {name: int(value) for name, value in result[0].items()}
+        totals['active_count'] = totals['registered_count'] + totals['attended_count']
+        totals['fill_rate'] = totals['active_count'] / totals['capacity'] if totals['capacity'] else 0
+        cache.set(key, totals, ttl=Config.DASHBOARD_TOTALS_TTL)
+        return totals
     
     def update(self, event_id, **kwargs):
         """Оновлення події"""
         allowed_fields = ['title', 'description', 'category_id', 'location', 'event_date', 
-                         'registration_deadline', 'max_participants', 'status', 'image_url']
+                         'registration_deadline', 'max_participants', 'status', 'image_url',
+                         'is_online', 'online_link']
         
         updates = []
         params = []
@@ -221,24 +1532,190 @@ class Event:
         if not updates:
             return False
         
+        if 'registration_deadline' in kwargs:
+            # Перенесений дедлайн знову відкриває (або закриває) реєстрацію
+            updates.append("registration_open = (%s > NOW())")
+            params.append(kwargs['registration_deadline'])
+        
         params.append(event_id)
         query = f"UPDATE events SET {', '.join(updates)} WHERE id = %s"
-        return self.db.execute_query(query, tuple(params)) is not None
+        if self.db.execute_query(query, tuple(params)) is None:
+            return False
+        self._reindex(event_id)
+        return True
+    
+    def advance_statuses(self, duration_hours=3, batch_size=500):
+        """Закриття реєстрації після дедлайну та переходи upcoming → ongoing → completed
+        
+        Кожен пакет — окрема коротка транзакція UPDATE ... ORDER BY ... LIMIT по індексу
+        (registration_open, registration_deadline) або (status, event_date), тому накопичений
+        за час простою обсяг не блокує таблицю надовго. Час береться з NOW() сервера, як і в reserve.
+        Повертає кількість змін за кроком або None.
+        """
+        steps = (
+            ('registration_closed', """
+                UPDATE events SET registration_open = 0
+                WHERE registration_open = 1 AND registration_deadline <= NOW()
+                ORDER BY registration_deadline LIMIT %s
+            """, ()),
+            ('ongoing', """
+                UPDATE events SET status = 'ongoing'
+                WHERE status = 'upcoming' AND event_date <= NOW()
+                ORDER BY event_date LIMIT %s
+            """, ()),
+            ('completed', """
+                UPDATE events SET status = 'completed'
+                WHERE status = 'ongoing' AND event_date <= NOW() - INTERVAL %s HOUR
+                ORDER BY event_date LIMIT %s
+            """, (duration_hours,)),
+        )
+        
+        counts = {}
+        try:
+            for name, query, params in steps:
+                counts[name] = 0
+                while True:
+                    with self.db.transaction() as cursor:
+                        cursor.execute(query, params + (batch_size,))
+                        changed = cursor.rowcount
+                    counts[name] += changed
+                    if changed < batch_size:
+                        break
+        except mysql.connector.Error as err:
+            print(f"Помилка оновлення статусів подій: {err}")
+            return None
+        finally:
+            if any(counts.values()):
+                invalidate_event_pages()
+                search_index.invalidate()
+        return counts
     
     def delete(self, event_id):
         """Видалення події"""
         query = "DELETE FROM events WHERE id = %s"
-        return self.db.execute_query(query, (event_id,)) is not None
+        if self.db.execute_query(query, (event_id,)) is None:
+            return False
+        _bump_data_version(self.db, 'events')
+        self._reindex(event_id)
+        return True
+    
+    def get_version(self, event_id, user_id=None):
+        """Валідатор сторінки події: час зміни події, версія даних і реєстрація користувача
+        
+        Коментарі, оцінки та реєстрації оновлюють лічильники в рядку події, тому змінюють і updated_at.
+        """
+        query = """
+            SELECT e.updated_at, r.status as registration_status,
+                   (SELECT version FROM data_versions WHERE name = 'events') as data_version
+            FROM events e
+            LEFT JOIN registrations r ON r.event_id = e.id AND r.user_id = %s
+            WHERE e.id = %s
+        """
+        result = self.db.execute_query(query, (user_id, event_id), fetch=True)
+        return result[0] if result else None
+    
+    def get_listing_version(self):
+        """Валідатор списків подій: остання зміна будь-якої події та версія даних"""
+        query = """
+            SELECT (SELECT MAX(updated_at) FROM events) as updated_at,
+                   (SELECT version FROM data_versions WHERE name = 'events') as data_version
+        """
+        result = self.db.execute_query(query, fetch=True)
+        return result[0] if result else None
+    
+    def get_by_ids(self, event_ids):
+        """Отримання подій за списком ID із збереженням порядку списку"""
+        if not event_ids:
+            return []
+        placeholders = ', '.join(['%s'] * len(event_ids))
+        query = f"""
+            SELECT e.*, c.name as category_name, u.full_name as organizer_name
+            FROM events e
+            LEFT JOIN event_categories c ON e.category_id = c.id
+            LEFT JOIN users u ON e.organizer_id = u.id
+            WHERE e.id IN ({placeholders})
+            ORDER BY FIELD(e.id, {placeholders})
+        """
+        return self.db.execute_query(query, tuple(event_ids) * 2, fetch=True)
+    
+    def search(self, text, status=None, category_id=None, page=1, per_page=10):
+        """Повнотекстовий пошук подій за назвою, описом, категорією та організатором
+        
+        Повертає словник з events і has_next; порядок — за спаданням релевантності.
+        """
+        offset = (page - 1) * per_page
+        if Config.SEARCH_BACKEND == 'memory':
+            if search_index.is_stale():
+                search_index.build(self.get_all() or [])
+            ids = search_index.search(text, status, category_id, offset=offset, limit=per_page + 1)
+            has_next = len(ids) > per_page
+            events = self.get_by_ids(ids[:per_page])
+        else:
+            # Беремо на один рядок більше, щоб знати, чи є наступна сторінка
+            events = self._search_fulltext(text, status, category_id, offset, per_page + 1)
+            has_next = events is not None and len(events) > per_page
+        
+        if events is None:
+            return None
+        return {'events': events[:per_page], 'has_next': has_next}
+    
+    def _search_fulltext(self, text, status, category_id, offset, limit):
+        """Пошук через FULLTEXT-індекси MySQL (назва/опис мають подвійну вагу)"""
+        query = """
+            SELECT e.*, c.name as category_name, u.full_name as organizer_name, m.relevance
+            FROM (
+                SELECT id, SUM(score) as relevance FROM (
+                    SELECT id, MATCH(title, description) AGAINST (%s) * 2 as score
+                    FROM events WHERE MATCH(title, description) AGAINST (%s)
+                    UNION ALL
+                    SELECT ev.id, MATCH(cat.name) AGAINST (%s)
+                    FROM event_categories cat JOIN events ev ON ev.category_id = cat.id
+                    WHERE MATCH(cat.name) AGAINST (%s)
+                    UNION ALL
+                    SELECT ev.id, MATCH(org.full_name) AGAINST (%s)
+                    FROM users org JOIN events ev ON ev.organizer_id = org.id
+                    WHERE MATCH(org.full_name) AGAINST (%s)
+                ) hits
+                GROUP BY id
+            ) m
+            JOIN events e ON e.id = m.id
+            LEFT JOIN event_categories c ON e.category_id = c.id
+            LEFT JOIN users u ON e.organizer_id = u.id
+            WHERE 1=1
+        """
+        params = [text] * 6
+        
+        if status:
+            query += " AND e.status = %s"
+            params.append(status)
+        
+        if category_id:
+            query += " AND e.category_id = %s"
+            params.append(category_id)
+        
+        query += " ORDER BY m.relevance DESC, e.id DESC LIMIT %s OFFSET %s"
+        params.extend([limit, offset])
+        return self.db.execute_query(query, tuple(params), fetch=True)
     
     def increment_participants(self, event_id):
         """Збільшення кількості учасників"""
         query = "UPDATE events SET current_participants = current_participants + 1 WHERE id = %s"
-        return self.db.execute_query(query, (event_id,)) is not None
+        if self.db.execute_query(query, (event_id,)) is None:
+            return False
+        invalidate_event_pages()
+        return True
     
     def decrement_participants(self, event_id):
         """Зменшення кількості учасників"""
         query = "UPDATE events SET current_participants = current_participants - 1 WHERE id = %s AND current_participants > 0"
-        return self.db.execute_query(query, (event_id,)) is not None
+        if self.db.execute_query(query, (event_id,)) is None:
+            return False
+        invalidate_event_pages()
+        return True
+
+
+class _AlreadyRegistered(Exception):
+    """Внутрішній сигнал для відкату бронювання вже зареєстрованого користувача"""
 
 
 class Registration:
@@ -249,49 +1726,263 @@ class Registration:
     
     def create(self, event_id, user_id, notes=None):
         """Створення реєстрації на подію"""
-        query = """
-            INSERT INTO registrations (event_id, user_id, notes)
-            VALUES (%s, %s, %s)
-        """
-        return self.db.execute_query(query, (event_id, user_id, notes))
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute("""
+                    INSERT INTO registrations (event_id, user_id, notes)
+                    VALUES (%s, %s, %s)
+                """, (event_id, user_id, notes))
+                registration_id = cursor.lastrowid
+                _adjust_registration_stats(cursor, event_id, _status_delta(None, 'registered'), signup=True)
+            return registration_id
+        except mysql.connector.Error as err:
+            print(f"Помилка створення реєстрації: {err}")
+            return None
     
     def get_by_user(self, user_id):
         """Отримання реєстрацій користувача"""
-        query = """
-            SELECT r.*, e.title, e.event_date, e.location, e.status as event_status
-            FROM registrations r
-            JOIN events e ON r.event_id = e.id
-            WHERE r.user_id = %s
-            ORDER BY r.registration_date DESC
-        """
-        return self.db.execute_query(query, (user_id,), fetch=True)
+        return self.db.execute_query(REGISTRATIONS_BY_USER_QUERY, (user_id,), fetch=True)
     
     def get_by_event(self, event_id):
         """Отримання реєстрацій на подію"""
+        return self.db.execute_query(REGISTRATIONS_BY_EVENT_QUERY, (event_id,), fetch=True)
+    
+    def reserve(self, event_id, user_id, notes=None, enforce_deadline=True):
+        """Атомарне бронювання місця: 'reserved', 'full', 'closed', 'already' або None при помилці
+        
+        Лічильник учасників збільшується умовним UPDATE лише за наявності вільних місць,
+        тому паралельні реєстрації не можуть перевищити max_participants. Після дедлайну
+        реєстрація закрита (організатор може додати учасника з enforce_deadline=False).
+        """
+        try:
+            with self.db.transaction() as cursor:
+                query = """
+                    UPDATE events SET current_participants = current_participants + 1
+                    WHERE id = %s AND current_participants < max_participants
+                """
+                if enforce_deadline:
+                    query += " AND status = 'upcoming' AND registration_open = 1 AND registration_deadline > NOW()"
+                cursor.execute(query, (event_id,))
+                if cursor.rowcount == 0:
+                    # Уже зареєстрованому повідомляємо саме про це, навіть якщо місць немає чи реєстрацію закрито
+                    cursor.execute(
+                        "SELECT status FROM registrations WHERE event_id = %s AND user_id = %s",
+                        (event_id, user_id)
+                    )
+                    registration = cursor.fetchone()
+                    if registration is not None and registration['status'] != 'cancelled':
+                        return 'already'
+                    if not enforce_deadline:
+                        return 'full'
+                    cursor.execute(
+                        "SELECT max_participants, current_participants FROM events WHERE id = %s", (event_id,)
+                    )
+                    event = cursor.fetchone()
+                    if event is None or event['current_participants'] >= event['max_participants']:
+                        return 'full'
+                    return 'closed'
+                
+                # Нова реєстрація або відновлення скасованої; активна лишається без змін (0 рядків)
+                cursor.execute("""
+                    INSERT INTO registrations (event_id, user_id, notes)
+                    VALUES (%s, %s, %s)
+                    ON DUPLICATE KEY UPDATE status = IF(status = 'cancelled', 'registered', status)
+                """, (event_id, user_id, notes))
+                if cursor.rowcount == 0:
+                    raise _AlreadyRegistered()
+                # 1 — новий рядок, 2 — відновлена скасована реєстрація
+                previous = 'cancelled' if cursor.rowcount == 2 else None
+                _adjust_registration_stats(cursor, event_id, _status_delta(previous, 'registered'), signup=True)
+            invalidate_event_pages()
+            return 'reserved'
+        except _AlreadyRegistered:
+            return 'already'
+        except mysql.connector.Error as err:
+            print(f"Помилка бронювання місця: {err}")
+            return None
+    
+    def bulk_reserve(self, event_id, user_ids):
+        """Пакетне бронювання місць однією транзакцією
+        
+        Повертає словник user_id -> 'added', 'reactivated', 'already' або 'full'
+        (місця розподіляються в порядку списку), None при помилці або відсутності події.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        try:
+            with self.db.transaction() as cursor:
+                # Блокування рядка події серіалізує імпорт з reserve() та іншими імпортами
+                cursor.execute(
+                    "SELECT max_participants, current_participants FROM events WHERE id = %s FOR UPDATE",
+                    (event_id,)
+                )
+                event = cursor.fetchone()
+                if event is None:
+                    return None
+                
+                existing = {}
+                if user_ids:
+                    placeholders = ', '.join(['%s'] * len(user_ids))
+                    cursor.execute(
+                        f"SELECT user_id, status FROM registrations WHERE event_id = %s AND user_id IN ({placeholders})",
+                        (event_id, *user_ids)
+                    )
+                    existing = {row['user_id']: row['status'] for row in cursor.fetchall()}
+                
+                free = max(event['max_participants'] - event['current_participants'], 0)
+                results = {}
+                accepted = []
+                for user_id in user_ids:
+                    status = existing.get(user_id)
+                    if status is not None and status != 'cancelled':
+                        results[user_id] = 'already'
+                    elif len(accepted) >= free:
+                        results[user_id] = 'full'
+                    else:
+                        results[user_id] = 'reactivated' if status == 'cancelled' else 'added'
+                        accepted.append(user_id)
+                
+                if accepted:
+                    cursor.executemany("""
+                        INSERT INTO registrations (event_id, user_id)
+                        VALUES (%s, %s)
+                        ON DUPLICATE KEY UPDATE status = 'registered'
+                    """, [(event_id, user_id) for user_id in accepted])
+                    cursor.execute(
+                        "UPDATE events SET current_participants = current_participants + %s WHERE id = %s",
+                        (len(accepted), event_id)
+                    )
+                    reactivated = sum(1 for user_id in accepted if results[user_id] == 'reactivated')
+                    _adjust_registration_stats(
+                        cursor, event_id,
+                        {'registered': len(accepted), 'attended': 0, 'cancelled': -reactivated},
+                        signup=True
+                    )
+            if accepted:
+                invalidate_event_pages()
+            return results
+        except mysql.connector.Error as err:
+            print(f"Помилка пакетного бронювання: {err}")
+            return None
+    
+    def cancel_reservation(self, event_id, user_id):
+        """Атомарне скасування реєстрації зі звільненням місця"""
+        try:
+            with self.db.transaction() as cursor:
+                # Рядок події блокується першим, як у reserve(): інакше зустрічний порядок блокувань
+                # зі скасуванням і повторною реєстрацією одночасно призводить до deadlock
+                cursor.execute("SELECT id FROM events WHERE id = %s FOR UPDATE", (event_id,))
+                if cursor.fetchone() is None:
+                    return False
+                cursor.execute(
+                    "SELECT status FROM registrations WHERE event_id = %s AND user_id = %s FOR UPDATE",
+                    (event_id, user_id)
+                )
+                registration = cursor.fetchone()
+                if registration is None or registration['status'] == 'cancelled':
+                    return False
+                cursor.execute(
+                    "UPDATE registrations SET status = 'cancelled' WHERE event_id = %s AND user_id = %s",
+                    (event_id, user_id)
+                )
+                cursor.execute("""
+                    UPDATE events SET current_participants = current_participants - 1
+                    WHERE id = %s AND current_participants > 0
+                """, (event_id,))
+                _adjust_registration_stats(cursor, event_id, _status_delta(registration['status'], 'cancelled'))
+            invalidate_event_pages()
+            return True
+        except mysql.connector.Error as err:
+            print(f"Помилка скасування реєстрації: {err}")
+            return False
+    
+    def stream_by_event(self, event_id):
+        """Потокове читання учасників події для експорту"""
         query = """
-            SELECT r.*, u.full_name, u.email, u.university
+            SELECT u.full_name, u.email, u.university, r.registration_date, r.status
             FROM registrations r
             JOIN users u ON r.user_id = u.id
             WHERE r.event_id = %s
             ORDER BY r.registration_date ASC
         """
-        return self.db.execute_query(query, (event_id,), fetch=True)
+        return self.db.stream_query(query, (event_id,))
     
     def check_registration(self, event_id, user_id):
         """Перевірка чи зареєстрований користувач"""
-        query = "SELECT * FROM registrations WHERE event_id = %s AND user_id = %s"
-        result = self.db.execute_query(query, (event_id, user_id), fetch=True)
+        result = self.db.execute_query(REGISTRATION_CHECK_QUERY, (event_id, user_id), fetch=True)
         return result[0] if result else None
     
     def update_status(self, registration_id, status):
         """Оновлення статусу реєстрації"""
-        query = "UPDATE registrations SET status = %s WHERE id = %s"
-        return self.db.execute_query(query, (status, registration_id)) is not None
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    "SELECT event_id, status FROM registrations WHERE id = %s FOR UPDATE", (registration_id,)
+                )
+                registration = cursor.fetchone()
+                if registration is None or registration['status'] == status:
+                    return True
+                cursor.execute("UPDATE registrations SET status = %s WHERE id = %s", (status, registration_id))
+                _adjust_registration_stats(cursor, registration['event_id'],
+                                           _status_delta(registration['status'], status))
+            return True
+        except mysql.connector.Error as err:
+            print(f"Помилка оновлення статусу реєстрації: {err}")
+            return False
     
     def cancel(self, event_id, user_id):
         """Скасування реєстрації"""
-        query = "UPDATE registrations SET status = 'cancelled' WHERE event_id = %s AND user_id = %s"
-        return self.db.execute_query(query, (event_id, user_id)) is not None
+        query = "SELECT id FROM registrations WHERE event_id = %s AND user_id = %s"
+        result = self.db.execute_query(query, (event_id, user_id), fetch=True)
+        if result is None:
+            return False
+        return self.update_status(result[0]['id'], 'cancelled') if result else True
+    
+    def get_recent(self, organizer_id=None, limit=10):
+        """Останні реєстрації на події організатора (усі події — для адміністратора)"""
+        query = """
+            SELECT r.event_id, r.registration_date, r.status, u.full_name, e.title
+            FROM registrations r
+            JOIN events e ON r.event_id = e.id
+            JOIN users u ON r.user_id = u.id
+        """
+        params = []
+        if organizer_id is not None:
+            query += " WHERE e.organizer_id = %s"
+            params.append(organizer_id)
+        query += " ORDER BY r.registration_date DESC LIMIT %s"
+        params.append(limit)
+        return self.db.execute_query(query, tuple(params), fetch=True)
+    
+    def rebuild_stats(self, batch_size=10000):
+        """Перерахунок event_registration_stats одним GROUP BY на пакет id подій"""
+        result = self.db.execute_query("SELECT COALESCE(MAX(id), 0) as max_id FROM events", fetch=True)
+        if result is None:
+            return None
+        
+        query = """
+            INSERT INTO event_registration_stats
+                (event_id, registered_count, attended_count, cancelled_count, last_registration_at)
+            SELECT e.id,
+                   COALESCE(SUM(r.status = 'registered'), 0),
+                   COALESCE(SUM(r.status = 'attended'), 0),
+                   COALESCE(SUM(r.status = 'cancelled'), 0),
+                   MAX(r.registration_date)
+            FROM events e
+            LEFT JOIN registrations r ON r.event_id = e.id
+            WHERE e.id BETWEEN %s AND %s
+            GROUP BY e.id
+            ON DUPLICATE KEY UPDATE
+                registered_count = VALUES(registered_count),
+                attended_count = VALUES(attended_count),
+                cancelled_count = VALUES(cancelled_count),
+                last_registration_at = VALUES(last_registration_at)
+        """
+        max_id = result[0]['max_id']
+        for start in range(1, max_id + 1, batch_size):
+            end = start + batch_size - 1
+            if self.db.execute_query(query, (start, end)) is None:
+                return None
+        return max_id
 
 
 class Category:
@@ -301,9 +1992,12 @@ class Category:
         self.db = db
     
     def get_all(self):
-        """Отримання всіх категорій"""
-        query = "SELECT * FROM event_categories ORDER BY name ASC"
-        return self.db.execute_query(query, fetch=True)
+        """Отримання всіх категорій (кешується)"""
+        return cache.get_or_load('categories:all', lambda: self.db.execute_query(CATEGORIES_QUERY, fetch=True))
+    
+    def invalidate_cache(self):
+        """Скидання кешу категорій після їх зміни"""
+        cache.invalidate('categories:all')
     
     def get_by_id(self, category_id):
         """Отримання категорії за ID"""
@@ -313,15 +2007,29 @@ class Category:
 
 
 class Comment:
-    """Модель коментаря"""
+    """Модель коментаря
+    
+    Кількість коментарів зберігається в events.comment_count і оновлюється разом зі вставкою.
+    """
     
     def __init__(self, db):
         self.db = db
     
     def create(self, event_id, user_id, comment_text):
         """Створення коментаря"""
-        query = "INSERT INTO comments (event_id, user_id, comment_text) VALUES (%s, %s, %s)"
-        return self.db.execute_query(query, (event_id, user_id, comment_text))
+        try:
+            with self.db.transaction() as cursor:
+                # Спершу виключне блокування рядка події: вставка коментаря бере на нього спільне
+                # блокування зовнішнього ключа, і зворотний порядок дає deadlock одночасних коментарів
+                cursor.execute("UPDATE events SET comment_count = comment_count + 1 WHERE id = %s", (event_id,))
+                cursor.execute(
+                    "INSERT INTO comments (event_id, user_id, comment_text) VALUES (%s, %s, %s)",
+                    (event_id, user_id, comment_text)
+                )
+                return cursor.lastrowid
+        except mysql.connector.Error as err:
+            print(f"Помилка збереження коментаря: {err}")
+            return None
     
     def get_by_event(self, event_id):
         """Отримання коментарів події"""
@@ -333,18 +2041,155 @@ class Comment:
             ORDER BY c.created_at DESC
         """
         return self.db.execute_query(query, (event_id,), fetch=True)
+    
+    def get_page(self, event_id, cursor=None, per_page=20):
+        """Сторінка коментарів від новіших до старіших (keyset за (created_at, id))
+        
+        Повертає словник з comments і next_cursor (None, якщо це остання сторінка).
+        """
+        query, params = _comment_page_query(event_id, cursor, per_page)
+        comments = self.db.execute_query(query, params, fetch=True)
+        if comments is None:
+            return None
+        return _comment_page(comments, per_page)
+    
+    def rebuild_counts(self, batch_size=10000):
+        """Перерахунок events.comment_count пакетами за діапазонами id подій"""
+        result = self.db.execute_query("SELECT COALESCE(MAX(id), 0) as max_id FROM events", fetch=True)
+        if result is None:
+            return None
+        
+        query = """
+            UPDATE events e
+            LEFT JOIN (
+                SELECT event_id, COUNT(*) as cnt
+                FROM comments
+                WHERE event_id BETWEEN %s AND %s
+                GROUP BY event_id
+            ) c ON c.event_id = e.id
+            SET e.comment_count = COALESCE(c.cnt, 0)
+            WHERE e.id BETWEEN %s AND %s
+        """
+        max_id = result[0]['max_id']
+        for start in range(1, max_id + 1, batch_size):
+            end = start + batch_size - 1
+            if self.db.execute_query(query, (start, end, start, end)) is None:
+                return None
+        return max_id
+
+
+def _comment_page_query(event_id, cursor, per_page):
+    """Запит і параметри сторінки коментарів (на один рядок більше — ознака наступної сторінки)"""
+    query = """
+        SELECT c.*, u.full_name
+        FROM comments c
+        JOIN users u ON c.user_id = u.id
+        WHERE c.event_id = %s
+    """
+    params = [event_id]
+    
+    key = _decode_cursor(cursor)
+    if key:
+        query += " AND (c.created_at < %s OR (c.created_at = %s AND c.id < %s))"
+        params.extend([key[0], key[0], key[1]])
+    
+    query += " ORDER BY c.created_at DESC, c.id DESC LIMIT %s"
+    params.append(per_page + 1)
+    return query, tuple(params)
+
+
+def _comment_page(comments, per_page):
+    """Обрізання зайвого рядка та курсор на наступну сторінку коментарів"""
+    has_more = len(comments) > per_page
+    comments = comments[:per_page]
+    return {
+        'comments': comments,
+        'next_cursor': _encode_cursor(comments[-1]['created_at'], comments[-1]['id']) if has_more else None,
+    }
 
 
 class Rating:
-    """Модель оцінки"""
+    """Модель оцінки
+    
+    Сума та кількість оцінок зберігаються в events (rating_sum, rating_count)
+    і оновлюються в тій самій транзакції, що й таблиця ratings. Кожна транзакція спершу блокує
+    рядок події, а потім рядок оцінки: за зворотного порядку одночасні оцінки події дають deadlock.
+    """
     
     def __init__(self, db):
         self.db = db
     
     def create(self, event_id, user_id, rating, review=None):
         """Створення оцінки"""
-        query = "INSERT INTO ratings (event_id, user_id, rating, review) VALUES (%s, %s, %s, %s)"
-        return self.db.execute_query(query, (event_id, user_id, rating, review))
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    "UPDATE events SET rating_sum = rating_sum + %s, rating_count = rating_count + 1 WHERE id = %s",
+                    (rating, event_id)
+                )
+                cursor.execute(
+                    "INSERT INTO ratings (event_id, user_id, rating, review) VALUES (%s, %s, %s, %s)",
+                    (event_id, user_id, rating, review)
+                )
+                rating_id = cursor.lastrowid
+            invalidate_event_pages()
+            return rating_id
+        except mysql.connector.Error as err:
+            print(f"Помилка збереження оцінки: {err}")
+            return None
+    
+    def update(self, event_id, user_id, rating, review=None):
+        """Зміна оцінки користувача"""
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute("SELECT id FROM events WHERE id = %s FOR UPDATE", (event_id,))
+                if cursor.fetchone() is None:
+                    return False
+                cursor.execute(
+                    "SELECT rating FROM ratings WHERE event_id = %s AND user_id = %s FOR UPDATE",
+                    (event_id, user_id)
+                )
+                row = cursor.fetchone()
+                if row is None:
+                    return False
+                cursor.execute(
+                    "UPDATE ratings SET rating = %s, review = %s WHERE event_id = %s AND user_id = %s",
+                    (rating, review, event_id, user_id)
+                )
+                cursor.execute(
+                    "UPDATE events SET rating_sum = rating_sum + %s WHERE id = %s",
+                    (rating - row['rating'], event_id)
+                )
+            invalidate_event_pages()
+            return True
+        except mysql.connector.Error as err:
+            print(f"Помилка збереження оцінки: {err}")
+            return False
+    
+    def delete(self, event_id, user_id):
+        """Видалення оцінки користувача"""
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute("SELECT id FROM events WHERE id = %s FOR UPDATE", (event_id,))
+                if cursor.fetchone() is None:
+                    return False
+                cursor.execute(
+                    "SELECT rating FROM ratings WHERE event_id = %s AND user_id = %s FOR UPDATE",
+                    (event_id, user_id)
+                )
+                row = cursor.fetchone()
+                if row is None:
+                    return False
+                cursor.execute("DELETE FROM ratings WHERE event_id = %s AND user_id = %s", (event_id, user_id))
+                cursor.execute(
+                    "UPDATE events SET rating_sum = rating_sum - %s, rating_count = rating_count - 1 WHERE id = %s",
+                    (row['rating'], event_id)
+                )
+            invalidate_event_pages()
+            return True
+        except mysql.connector.Error as err:
+            print(f"Помилка видалення оцінки: {err}")
+            return False
     
     def get_by_event(self, event_id):
         """Отримання оцінок події"""
@@ -359,6 +2204,29 @@ class Rating:
     
     def get_average(self, event_id):
         """Отримання середньої оцінки події"""
-        query = "SELECT AVG(rating) as avg_rating, COUNT(*) as count FROM ratings WHERE event_id = %s"
-        result = self.db.execute_query(query, (event_id,), fetch=True)
+        result = self.db.execute_query(RATING_AVERAGE_QUERY, (event_id,), fetch=True)
         return result[0] if result else {'avg_rating': 0, 'count': 0}
+    
+    def rebuild_aggregates(self, batch_size=10000):
+        """Перерахунок rating_sum/rating_count з таблиці ratings пакетами за діапазонами id подій"""
+        result = self.db.execute_query("SELECT COALESCE(MAX(id), 0) as max_id FROM events", fetch=True)
+        if result is None:
+            return None
+        
+        query = """
+            UPDATE events e
+            LEFT JOIN (
+                SELECT event_id, SUM(rating) as total, COUNT(*) as cnt
+                FROM ratings
+                WHERE event_id BETWEEN %s AND %s
+                GROUP BY event_id
+            ) r ON r.event_id = e.id
+            SET e.rating_sum = COALESCE(r.total, 0), e.rating_count = COALESCE(r.cnt, 0)
+            WHERE e.id BETWEEN %s AND %s
+        """
+        max_id = result[0]['max_id']
+        for start in range(1, max_id + 1, batch_size):
+            end = start + batch_size - 1
+            if self.db.execute_query(query, (start, end, start, end)) is None:
+                return None
+        return max_id
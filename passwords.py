@@ -0,0 +1,95 @@
+"""Хешування паролів в окремих процесах.
+
+scrypt/pbkdf2 навмисно дорогі й тримають GIL десятки мілісекунд, тому під час масового входу
+обчислення в потоці запиту гальмує всі сторінки воркера. PasswordHasher виконує їх у пулі
+процесів з обмеженою чергою; потік запиту лише чекає на результат і не блокує інші потоки.
+
+Пул створюється при першому хешуванні, а не під час імпорту: за методом запуску spawn
+(Windows, macOS) кожен процес пулу заново імпортує застосунок.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from config import Config
+
+
+class PasswordHasherBusy(Exception):
+    """Черга хешування заповнена довше за timeout"""
+
+
+class PasswordHasher:
+    """Хешування та перевірка паролів у пулі процесів (workers=0 — у поточному потоці)"""
+
+    def __init__(self, method='scrypt', workers=2, max_pending=16, timeout=10):
+        self.method = method
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._pid = None
+        self._prefix = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Запуск процесів пулу (викликається з _run при першому хешуванні)"""
+        if not self.workers:
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # Пул, успадкований від батьківського процесу (gunicorn --preload), тут непридатний
+                self._executor = None
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                self._pid = os.getpid()
+                # Процеси створюються на вимогу — запускаємо всі одразу
+                for future in [self._executor.submit(os.getpid) for _ in range(self.workers)]:
+                    future.result()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def _run(self, func, *args):
+        """Виконання func у пулі з обмеженням кількості запитів, що чекають"""
+        if not self.workers:
+            return func(*args)
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PasswordHasherBusy("Черга хешування паролів заповнена")
+        try:
+            self.start()
+            future = self._executor.submit(func, *args)
+            try:
+                return future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                future.cancel()
+                raise PasswordHasherBusy("Хешування пароля не завершилося вчасно")
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        """Хеш пароля з методом і параметрами з конфігурації"""
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        """Перевірка пароля (метод і параметри беруться з самого хешу)"""
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """Чи збережено хеш з іншим методом або параметрами, ніж у конфігурації"""
+        if self._prefix is None:
+            # "scrypt" -> "scrypt:32768:8:1": параметри за замовчуванням підставляє Werkzeug
+            self._prefix = self._run(generate_password_hash, '', self.method).split('$', 1)[0]
+        return password_hash.split('$', 1)[0] != self._prefix
+
+
+password_hasher = PasswordHasher(
+    method=Config.PASSWORD_HASH_METHOD,
+    workers=Config.PASSWORD_HASH_WORKERS,
+    max_pending=Config.PASSWORD_HASH_MAX_PENDING,
+    timeout=Config.PASSWORD_HASH_TIMEOUT
+)
@@ -0,0 +1,151 @@
+"""Перевірка планів «гарячих» запитів через EXPLAIN.
+
+Викликає методи моделей, що обслуговують основні сторінки, збирає виконані ними SELECT-и
+(Database.capture_queries) і виконує для кожного EXPLAIN. Повне сканування таблиці (type = ALL)
+або сортування без індексу (Using filesort) вважається помилкою.
+
+На кількох рядках оптимізатор обирає повне сканування навіть за наявності індексу, тому
+перевірку варто запускати на реалістичному наборі: python -m benchmarks.dataset.
+
+Запуск: flask --app app check-query-plans
+"""
+import re
+
+from models import User, Event, Registration, Comment, Rating, cache
+
+# Довідники на кілька десятків рядків: повне сканування тут дешевше за індекс
+SMALL_TABLES = {'event_categories', 'data_versions', 'schema_migrations'}
+
+
+def _sample_ids(db):
+    """Ідентифікатори реальних рядків для параметрів запитів"""
+    connection = db.get_connection()
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute("SELECT id, organizer_id, category_id FROM events ORDER BY id DESC LIMIT 1")
+        event = cursor.fetchone() or {'id': 1, 'organizer_id': 1, 'category_id': 1}
+        cursor.execute("SELECT user_id FROM registrations WHERE event_id = %s LIMIT 1", (event['id'],))
+        registration = cursor.fetchone()
+        cursor.execute("SELECT id, email FROM users ORDER BY id DESC LIMIT 1")
+        user = cursor.fetchone() or {'id': 1, 'email': ''}
+        return {
+            'event_id': event['id'],
+            'organizer_id': event['organizer_id'],
+            'category_id': event['category_id'] or 1,
+            'user_id': registration['user_id'] if registration else user['id'],
+            'email': user['email'],
+        }
+    finally:
+        cursor.close()
+        db.release()
+
+
+def hot_reads(db, ids):
+    """Перелік (назва, виклик, допустиме filesort) для запитів основних сторінок"""
+    user, event, registration = User(db), Event(db), Registration(db)
+    comment, rating = Comment(db), Rating(db)
+
+    def event_pages(**filters):
+        page = event.get_page(**filters)
+        if page and page['next_cursor']:
+            event.get_page(cursor=page['next_cursor'], **filters)
+
+    def user_pages(**filters):
+        page = user.get_page(**filters)
+        if page and page['next_cursor']:
+            user.get_page(cursor=page['next_cursor'], **filters)
+
+    def comment_pages():
+        page = comment.get_page(ids['event_id'], per_page=5)
+        if page and page['next_cursor']:
+            comment.get_page(ids['event_id'], cursor=page['next_cursor'], per_page=5)
+
+    return [
+        ('User.get_principal', lambda: user.get_principal(ids['user_id']), False),
+        ('User.get_by_email', lambda: user.get_by_email(ids['email']), False),
+        ('User.get_page', lambda: user_pages(), False),
+        ('User.get_page(role)', lambda: user_pages(role='student'), False),
+        ('User.get_page(search)', lambda: user_pages(search=ids['email'][:2], field='email'), False),
+        ('User.get_page(search, role)',
+         lambda: user_pages(search=ids['email'][:2], field='email', role='student'), False),
+        ('Event.get_by_id', lambda: event.get_by_id(ids['event_id']), False),
+        ('Event.load_detail', lambda: event.load_detail(ids['event_id'], ids['user_id']), False),
+        ('Event.get_version', lambda: event.get_version(ids['event_id'], ids['user_id']), False),
+        ('Event.get_listing_version', lambda: event.get_listing_version(), False),
+        ('Event.get_all(upcoming)', lambda: event.get_all(status='upcoming', limit=6), False),
+        ('Event.get_page(status)', lambda: event_pages(status='upcoming'), False),
+        ('Event.get_page(category)',
+         lambda: event_pages(status='upcoming', category_id=ids['category_id']), False),
+        ('Event.get_by_organizer', lambda: event.get_by_organizer(ids['organizer_id']), False),
+        ('Event.get_dashboard_page', lambda: event.get_dashboard_page(ids['organizer_id']), False),
+        ('Event.get_dashboard_page(admin)', lambda: event.get_dashboard_page(), False),
+        # Результати повнотекстового пошуку впорядковуються за релевантністю — сортування неминуче
+        ('Event.search', lambda: event.search('event', status='upcoming'), True),
+        ('Registration.get_by_user', lambda: registration.get_by_user(ids['user_id']), False),
+        ('Registration.get_by_event', lambda: registration.get_by_event(ids['event_id']), False),
+        ('Registration.get_recent(admin)', lambda: registration.get_recent(), False),
+        # Реєстрації кількох подій організатора зливаються за датою — сортування лише по його реєстраціях
+        ('Registration.get_recent', lambda: registration.get_recent(ids['organizer_id']), True),
+        ('Registration.check_registration',
+         lambda: registration.check_registration(ids['event_id'], ids['user_id']), False),
+        ('Comment.get_page', comment_pages, False),
+        ('Rating.get_average', lambda: rating.get_average(ids['event_id']), False),
+    ]
+
+
+def _statements(query, params):
+    """Розбиття багатоінструкційного запиту на (інструкція, її параметри)"""
+    params = tuple(params or ())
+    result = []
+    for statement in query.split(';'):
+        statement = statement.strip()
+        if not statement:
+            continue
+        count = statement.count('%s')
+        result.append((statement, params[:count]))
+        params = params[count:]
+    return result
+
+
+def _problems(row, allow_filesort):
+    table = row.get('table') or ''
+    extra = row.get('Extra') or ''
+    problems = []
+    if row.get('type') == 'ALL' and table not in SMALL_TABLES and not table.startswith('<'):
+        problems.append('повне сканування')
+    if 'Using filesort' in extra and not allow_filesort:
+        problems.append('filesort')
+    return problems
+
+
+def check(db, verbose=True):
+    """EXPLAIN усіх гарячих запитів; список (назва, таблиця, проблеми, запит)"""
+    ids = _sample_ids(db)
+    # Запити, що кешуються, мають дійти до БД
+    cache.clear()
+    failures = []
+    for name, call, allow_filesort in hot_reads(db, ids):
+        with db.capture_queries() as captured:
+            call()
+        db.release()
+
+        connection = db.get_connection()
+        cursor = connection.cursor(dictionary=True)
+        try:
+            for query, params in captured:
+                for statement, statement_params in _statements(query, params):
+                    if not re.match(r'\s*(SELECT|WITH)\b', statement, re.IGNORECASE):
+                        continue
+                    cursor.execute("EXPLAIN " + statement, statement_params)
+                    for row in cursor.fetchall():
+                        problems = _problems(row, allow_filesort)
+                        if verbose:
+                            mark = ', '.join(problems) if problems else 'OK'
+                            print(f"{name:<34} {row.get('table') or '-':<20} {row.get('type') or '-':<8} "
+                                  f"{row.get('key') or '-':<28} {row.get('rows') or 0:>9}  {mark}")
+                        if problems:
+                            failures.append((name, row.get('table'), problems, ' '.join(statement.split())))
+        finally:
+            cursor.close()
+            db.release()
+    return failures
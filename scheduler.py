@@ -0,0 +1,54 @@
+"""Фоновий планувальник життєвого циклу подій.
+
+Періодично закриває реєстрацію після дедлайну та переводить події upcoming → ongoing → completed
+(Event.advance_statuses). Оновлення ідемпотентні, тому кілька воркерів з власними планувальниками
+не конфліктують; для розгортань без фонових потоків є команда flask advance-event-statuses.
+"""
+import logging
+import threading
+
+from models import Event
+
+logger = logging.getLogger(__name__)
+
+
+class EventStatusScheduler:
+    """Потік, що викликає Event.advance_statuses кожні interval секунд"""
+
+    def __init__(self, db, interval=60, duration_hours=3, batch_size=500):
+        self.db = db
+        self.interval = interval
+        self.duration_hours = duration_hours
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self):
+        """Один прохід переходів; кількість змінених подій за кроком або None"""
+        try:
+            counts = Event(self.db).advance_statuses(duration_hours=self.duration_hours,
+                                                     batch_size=self.batch_size)
+        finally:
+            self.db.release()
+        if counts and any(counts.values()):
+            logger.info("Статуси подій оновлено: %s", counts)
+        return counts
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Помилка планувальника статусів подій")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='event-status-scheduler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -319,82 +319,93 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     });
 
-    // Кастомний autocomplete для університетів
+    // Кастомний autocomplete для університетів (підказки з сервера за префіксом)
     const universityInput = document.getElementById('university');
     const dropdown = document.getElementById('university-dropdown');
     
-    if (universityInput && dropdown) {
-        const items = Array.from(dropdown.querySelectorAll('.autocomplete-item'));
+    if (universityInput && dropdown && universityInput.dataset.suggestUrl) {
+        let items = [];
         let currentFocus = -1;
+        let debounceTimer = null;
+        let lastQuery = '';
+
+        function renderSuggestions(suggestions) {
+            dropdown.innerHTML = '';
+            items = suggestions.map(name => {
+                const item = document.createElement('div');
+                item.className = 'autocomplete-item';
+                item.dataset.value = name;
+                item.textContent = name;
+                item.addEventListener('click', function() {
+                    universityInput.value = this.dataset.value;
+                    dropdown.classList.remove('show');
+                    currentFocus = -1;
+                });
+                dropdown.appendChild(item);
+                return item;
+            });
+            currentFocus = -1;
+            dropdown.classList.toggle('show', items.length > 0);
+        }
 
         universityInput.addEventListener('input', function() {
-            const value = this.value.toLowerCase();
-            currentFocus = -1;
+            const value = this.value.trim();
+            clearTimeout(debounceTimer);
             
             if (!value) {
-                dropdown.classList.remove('show');
+                renderSuggestions([]);
                 return;
             }
 
-            let hasResults = false;
-            items.forEach(item => {
-                const text = item.textContent.toLowerCase();
-                if (text.includes(value)) {
-                    item.style.display = 'block';
-                    hasResults = true;
-                } else {
-                    item.style.display = 'none';
-                }
-            });
-
-            dropdown.classList.toggle('show', hasResults);
+            debounceTimer = setTimeout(() => {
+                lastQuery = value;
+                fetch(`${universityInput.dataset.suggestUrl}?q=${encodeURIComponent(value)}&limit=10`)
+                    .then(response => response.json())
+                    .then(suggestions => {
+                        // Відповідь на застарілий запит ігноруємо
+                        if (value === lastQuery && Array.isArray(suggestions)) {
+                            renderSuggestions(suggestions);
+                        }
+                    })
+                    .catch(() => renderSuggestions([]));
+            }, 150);
         });
 
         universityInput.addEventListener('focus', function() {
-            if (this.value) {
+            if (this.value && items.length) {
                 dropdown.classList.add('show');
             }
         });
 
         universityInput.addEventListener('keydown', function(e) {
-            const visibleItems = items.filter(item => item.style.display !== 'none');
-            
             if (e.key === 'ArrowDown') {
                 e.preventDefault();
                 currentFocus++;
-                if (currentFocus >= visibleItems.length) currentFocus = 0;
-                setActive(visibleItems);
+                if (currentFocus >= items.length) currentFocus = 0;
+                setActive();
             } else if (e.key === 'ArrowUp') {
                 e.preventDefault();
                 currentFocus--;
-                if (currentFocus < 0) currentFocus = visibleItems.length - 1;
-                setActive(visibleItems);
+                if (currentFocus < 0) currentFocus = items.length - 1;
+                setActive();
             } else if (e.key === 'Enter') {
-                e.preventDefault();
-                if (currentFocus > -1 && visibleItems[currentFocus]) {
-                    visibleItems[currentFocus].click();
+                if (currentFocus > -1 && items[currentFocus]) {
+                    e.preventDefault();
+                    items[currentFocus].click();
                 }
             } else if (e.key === 'Escape') {
                 dropdown.classList.remove('show');
             }
         });
 
-        function setActive(visibleItems) {
+        function setActive() {
             items.forEach(item => item.classList.remove('active'));
-            if (visibleItems[currentFocus]) {
-                visibleItems[currentFocus].classList.add('active');
-                visibleItems[currentFocus].scrollIntoView({ block: 'nearest' });
+            if (items[currentFocus]) {
+                items[currentFocus].classList.add('active');
+                items[currentFocus].scrollIntoView({ block: 'nearest' });
             }
         }
 
-        items.forEach(item => {
-            item.addEventListener('click', function() {
-                universityInput.value = this.dataset.value;
-                dropdown.classList.remove('show');
-                currentFocus = -1;
-            });
-        });
-
         document.addEventListener('click', function(e) {
             if (!universityInput.contains(e.target) && !dropdown.contains(e.target)) {
                 dropdown.classList.remove('show');
@@ -402,6 +413,51 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 
+    // Довантаження коментарів події сторінками
+    const loadMoreComments = document.getElementById('load-more-comments');
+    const commentsList = document.getElementById('comments-list');
+
+    if (loadMoreComments && commentsList) {
+        loadMoreComments.addEventListener('click', function() {
+            const url = `${this.dataset.url}?before=${encodeURIComponent(this.dataset.cursor)}`;
+            this.disabled = true;
+
+            fetch(url)
+                .then(response => response.json())
+                .then(data => {
+                    data.comments.forEach(comment => {
+                        const item = document.createElement('div');
+                        item.className = 'comment';
+
+                        const header = document.createElement('div');
+                        header.className = 'comment-header';
+                        const author = document.createElement('strong');
+                        author.textContent = comment.full_name;
+                        const date = document.createElement('span');
+                        date.className = 'comment-date';
+                        date.textContent = comment.created_at;
+                        header.append(author, ' ', date);
+
+                        const text = document.createElement('p');
+                        text.textContent = comment.comment_text;
+
+                        item.append(header, text);
+                        commentsList.appendChild(item);
+                    });
+
+                    if (data.next_cursor) {
+                        this.dataset.cursor = data.next_cursor;
+                        this.disabled = false;
+                    } else {
+                        this.remove();
+                    }
+                })
+                .catch(() => {
+                    this.disabled = false;
+                });
+        });
+    }
+
     // Підтвердження виходу
     const logoutLink = document.querySelector('a[href*="logout"]');
     if (logoutLink) {